@@ -0,0 +1,91 @@
+#!/usr/bin/python
+#
+# end-to-end benchmark: full builds against the stand-in saga_api and saga_cmd in bench/fake
+#
+# usage: python bench/bench_build.py [--sizes 4x25x8,16x50x12] [--cmd-latency 0.0] [--load-latency 0.0] [-- parse_modules.py options]
+#
+# a size NxMxK means N libraries with M tools of K parameters each, every size is built from scratch in a
+# temporary directory and reported in tools per second and peak resident memory of the largest process
+#
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+BENCH_PATH = os.path.dirname(os.path.abspath(__file__))
+REPO_PATH = os.path.dirname(BENCH_PATH)
+FAKE_PATH = os.path.join(BENCH_PATH, 'fake')
+
+def create_libraries(libpath=None, libraries=None, tools=None, params=None):
+    """ write N library spec files for the fake saga_api """
+    os.makedirs(libpath)
+    for i in range(libraries):
+        with open(os.path.join(libpath, 'libbench_%d.so' % i), 'w') as f:
+            json.dump({'tools' : tools, 'params' : params}, f)
+
+def create_workdir(workdir=None):
+    """ link templates, static files and WIKI links, parse_modules.py reads them relative to the working directory """
+    os.makedirs(os.path.join(workdir, 'html'))
+    os.symlink(os.path.join(REPO_PATH, 'templates'), os.path.join(workdir, 'templates'))
+    os.symlink(os.path.join(REPO_PATH, 'wikilinks.txt'), os.path.join(workdir, 'wikilinks.txt'))
+    for subdir in ('lib', 'icons'):
+        os.symlink(os.path.join(REPO_PATH, 'html', subdir), os.path.join(workdir, 'html', subdir))
+
+def run_build(workdir=None, libpath=None, options=None, cmd_latency=None, load_latency=None):
+    """ run a build and return (seconds, peak RSS in MB, exit code) """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = FAKE_PATH + os.pathsep + env.get('PYTHONPATH', '')
+    env['PATH'] = FAKE_PATH + os.pathsep + env['PATH']
+    env['FAKE_SAGA_LIBPATH'] = libpath
+    env['FAKE_SAGA_CMD_LATENCY'] = str(cmd_latency)
+    env['FAKE_SAGA_LOAD_LATENCY'] = str(load_latency)
+
+    start = time.perf_counter()
+    with open(os.path.join(workdir, 'build.log'), 'w') as log:
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(REPO_PATH, 'parse_modules.py'), '--libpath', libpath] + options,
+            cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        # wait4 reports the peak RSS of the build and its children, the largest single process counts
+        pid, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    seconds = time.perf_counter() - start
+    return seconds, rusage.ru_maxrss / 1024.0, proc.returncode
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark full builds with a stand-in SAGA installation.')
+    parser.add_argument('--sizes', default='4x25x8,16x50x12', help='comma separated sizes as libraries x tools x parameters (default: 4x25x8,16x50x12)')
+    parser.add_argument('--cmd-latency', type=float, default=0.0, help='seconds per saga_cmd call (default: 0)')
+    parser.add_argument('--load-latency', type=float, default=0.0, help='seconds per Add_Library call (default: 0)')
+    parser.add_argument('--keep', action='store_true', help='keep the temporary build directories')
+    parser.add_argument('options', nargs='*', help='options passed to parse_modules.py after --, e.g. -- --usage native --processes 4')
+    args = parser.parse_args()
+
+    print('{:>14} {:>8} {:>10} {:>10} {:>10}'.format('size', 'tools', 'seconds', 'tools/s', 'peak MB'))
+    for size in args.sizes.split(','):
+        libraries, tools, params = [int(n) for n in size.lower().split('x')]
+        tmp = tempfile.mkdtemp(prefix='bench_build_')
+        try:
+            libpath = os.path.join(tmp, 'libs')
+            create_libraries(libpath, libraries, tools, params)
+            create_workdir(os.path.join(tmp, 'work'))
+            seconds, peak, returncode = run_build(os.path.join(tmp, 'work'), libpath, args.options, args.cmd_latency, args.load_latency)
+            if returncode:
+                print('ERROR: build of size {} failed, see {}/work/build.log'.format(size, tmp))
+                args.keep = True
+                continue
+            count = libraries * tools
+            print('{:>14} {:>8} {:>10.2f} {:>10.1f} {:>10.1f}'.format(size, count, seconds, count / seconds, peak))
+        finally:
+            if args.keep:
+                print('kept {}'.format(tmp))
+            else:
+                shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/python
+#
+# micro-benchmark: index and a2z pages from compact index entries streamed to disk vs. full library details and string concatenation
+#
+# usage: python bench/bench_index.py [--tools 1000,10000,100000] [--per-library 50]
+#
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+# run from repository root as templates are read from ./templates
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, '.')
+
+import parse_modules
+
+def synthetic_libraries(tools=None, per_library=None):
+    """ yield library records as written to the metadata store """
+    for lib in range((tools + per_library - 1) // per_library):
+        count = min(per_library, tools - lib * per_library)
+        record = {
+            'kind' : 'library',
+            'fname' : 'libbench_%d.so' % lib,
+            'fingerprint' : {'size' : 0, 'mtime' : 0, 'sha1' : ''},
+            'is_Complete' : True,
+            'lib_name' : 'bench_%d' % lib,
+            'lib_title' : 'Bench - Library %d' % lib,
+            'library' : {
+                'Get_Author' : 'A. Author',
+                'Get_Count' : count,
+                'Get_Description' : 'description of library %d ' % lib * 20,
+                'Get_File_Name' : '/usr/lib/saga/libbench_%d.so' % lib,
+                'Get_Library_Name' : 'bench_%d' % lib,
+                'Get_Menu' : 'Bench',
+                'Get_Name' : 'Library %d' % lib,
+                'Get_Version' : '1.0',
+                'is_Valid' : True,
+                'doc_Links' : {},
+                'WIKI_Link' : None,
+            },
+            'tools' : [],
+        }
+        for i in range(count):
+            title = 'Tool %d' % (lib * per_library + i)
+            link = 'bench_%d_%d.html' % (lib, i)
+            record['library']['doc_Links'][title] = link
+            record['tools'].append((title, link, 'Bench|Library %d' % lib))
+        yield record
+
+def concatenated_pages(lib_records=None, renderer=None):
+    """ previous path: library details and prebuilt a2z rows kept in dicts, pages built with += """
+    libraries = {}
+    a2z = {}
+    for lib_record in lib_records:
+        libraries[lib_record['lib_title']] = lib_record['library']
+        for tool_title, link, menu_path in lib_record['tools']:
+            if not tool_title in a2z:
+                a2z[tool_title] = []
+            a2z[tool_title].append((link, menu_path))
+
+    library_links = ''
+    for lib_name in sorted(libraries.keys()):
+        library_links += "<tr><td style='white-space: nowrap'><a href='%s'>%s</a></td><td>%s</td><td class='center'>%s</td></tr>" % (
+            "%s.html" % parse_modules.util.lib_name_from_so(libraries[lib_name]['Get_File_Name']),
+            lib_name,
+            libraries[lib_name]['Get_Description'],
+            len(libraries[lib_name]['doc_Links'].keys())
+        )
+    # rows in title order with sort ranks for lib/tablesort.js: the row itself and the order of menu path, title and row
+    rows = []
+    for name in sorted(a2z.keys()):
+        for link, menu_path in a2z[name]:
+            rows.append((name, link, menu_path))
+    menu_ranks = {}
+    for rank, row in enumerate(sorted(range(len(rows)), key=lambda row: (rows[row][2], rows[row][0], row))):
+        menu_ranks[row] = rank
+    a2z_links = ''
+    for row, (name, link, menu_path) in enumerate(rows):
+        a2z_links += '<tr><td data-rank="%d"><a href="%s">%s</a></td><td class="menuPath" data-rank="%d">%s</td></tr>\n' % (
+            row, link, name, menu_ranks[row], menu_path
+        )
+
+    terms = renderer.get_terms()
+    terms['Library_Links'] = library_links
+    terms['A2Z_Links'] = a2z_links
+    return renderer.templates.render('index', terms), renderer.templates.render('a2z', terms)
+
+def measure(func=None):
+    """ return result, seconds and peak traced memory in MB of func() """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024.0 / 1024.0
+    tracemalloc.stop()
+    return result, seconds, peak
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark index and a2z page creation.')
+    parser.add_argument('--tools', default='1000,10000,100000', help='comma separated numbers of synthetic tools')
+    parser.add_argument('--per-library', type=int, default=50, help='number of tools per library')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        renderer = parse_modules.PageRenderer('0.0.0')
+        html_path = '%s/html' % tmp
+        print('{:>8} {:>12} {:>10} {:>12} {:>10}'.format('tools', 'concat s', 'concat MB', 'stream s', 'stream MB'))
+        for tools in [int(n) for n in args.tools.split(',')]:
+            # both variants get their library records streamed from the generator, only what they keep counts
+            def concatenated():
+                return concatenated_pages(synthetic_libraries(tools, args.per_library), renderer)
+
+            def streamed():
+                store = parse_modules.MetadataStore('%s/store.jsonl' % tmp)
+                store.create('0.0.0')
+                page_index = parse_modules.PageIndex()
+                for lib_record in synthetic_libraries(tools, args.per_library):
+                    page_index.add(lib_record, store.write(lib_record))
+                store.close()
+                output = parse_modules.BuildOutput(html_path, renderer, logs=False)
+                output.page('index.html', renderer.index_page(page_index, store))
+                output.page('a2z.html', renderer.a2z_page(page_index, store))
+                output.close()
+
+            pages, old_time, old_peak = measure(concatenated)
+            # silence the "created ..." messages of the output
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w')
+            result, new_time, new_peak = measure(streamed)
+            sys.stdout.close()
+            sys.stdout = stdout
+
+            for fname, html in zip(('index.html', 'a2z.html'), pages):
+                with open('%s/%s' % (html_path, fname), encoding='utf8') as f:
+                    if f.read() != html:
+                        print('ERROR: streamed {} differs'.format(fname))
+                        sys.exit(1)
+
+            print('{:>8} {:>12.3f} {:>10.1f} {:>12.3f} {:>10.1f}'.format(tools, old_time, old_peak, new_time, new_peak))
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+#
+# micro-benchmark: per-tool parameter introspection with the previous parse_parameters vs. the current one
+#
+# usage: python bench/bench_parameters.py [--tools 2000] [--params 12]
+#
+# runs against the stand-in saga_api in bench/fake, calls to it are counted as a measure of SWIG round-trips
+#
+
+import os
+import sys
+import time
+import argparse
+
+# run from repository root, the stand-in saga_api is imported from bench/fake
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, '.')
+sys.path.insert(0, './bench/fake')
+
+import saga_api
+import parse_modules
+
+def previous_parse_parameters(tool_obj=None):
+    """ previous implementation: parameters object fetched twice per parameter, every getter called for every parameter """
+    def cstr_2_str(value=None):
+        if value:
+            if type(value.c_str()) == str:
+                return value.c_str()
+            return value.c_str().encode('utf8')
+        return ''
+
+    params = {}
+    for n in range(0, tool_obj.Get_Parameters().Get_Count()):
+        param = tool_obj.Get_Parameters().Get_Parameter(n)
+        param_type = ""
+        if param.is_Input():
+            param_type = "Input"
+        elif param.is_Output():
+            param_type = "Output"
+        elif param.is_Option() and param.Get_Type() != 14:  #PARAMETER_TYPE_Grid_System
+            param_type = "Options"
+        else:
+            continue
+        if not param_type in params:
+            params[param_type] = []
+        params[param_type].append({
+            'index' : n,
+            'Get_Name' : param.Get_Name(),
+            'Get_Identifier' : param.Get_Identifier(),
+            'Get_Type' : param.Get_Type(),
+            'Get_Type_Identifier' : cstr_2_str(param.Get_Type_Identifier()),
+            'Get_Type_Name' : cstr_2_str(param.Get_Type_Name()),
+            'Get_Description' : param.Get_Description(),
+            'Get_Description_2' : cstr_2_str(param.Get_Description(2)),
+            'Get_Description_8' : cstr_2_str(param.Get_Description(8)),
+            'is_Information' : param.is_Information(),
+            'is_Input' : param.is_Input(),
+            'is_Option' : param.is_Option(),
+            'is_Optional' : param.is_Optional(),
+            'is_Output' : param.is_Output(),
+        })
+    return params
+
+class Counted():
+    """ proxy counting method calls of the wrapped stand-in object and of the objects they return """
+    calls = 0
+
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    def __getattr__(self, name=None):
+        method = getattr(self.obj, name)
+        def call(*args):
+            Counted.calls += 1
+            result = method(*args)
+            return Counted(result) if type(result).__module__ == 'saga_api' else result
+        return call
+
+def measure(parse=None, tools=None):
+    """ return seconds per tool and stand-in calls per tool of parse() over all tools """
+    start = time.perf_counter()
+    for tool in tools:
+        parse(tool)
+    seconds = (time.perf_counter() - start) / len(tools)
+
+    Counted.calls = 0
+    for tool in tools:
+        parse(Counted(tool))
+    return seconds, Counted.calls / float(len(tools))
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark parameter introspection.')
+    parser.add_argument('--tools', type=int, default=2000, help='number of synthetic tools')
+    parser.add_argument('--params', type=int, default=12, help='number of parameters per tool')
+    args = parser.parse_args()
+
+    spec = {'name' : 'bench', 'params' : args.params}
+    tools = [saga_api.CSG_Tool(spec, i) for i in range(args.tools)]
+
+    # both variants have to extract the same values
+    for tool in tools[:50]:
+        previous = previous_parse_parameters(tool)
+        current = parse_modules.util.expand_parameters({'Get_Parameters' : parse_modules.util.parse_parameters(tool)})['Get_Parameters']
+        if previous != current:
+            print('ERROR: parameters of tool {} differ'.format(tool.i))
+            sys.exit(1)
+
+    old_time, old_calls = measure(previous_parse_parameters, tools)
+    new_time, new_calls = measure(parse_modules.util.parse_parameters, tools)
+
+    print('{} tools, {} parameters each'.format(args.tools, args.params))
+    print('previous: {:8.1f} us/tool {:8.1f} calls/tool'.format(old_time * 1e6, old_calls))
+    print('current:  {:8.1f} us/tool {:8.1f} calls/tool'.format(new_time * 1e6, new_calls))
+    print('speedup:  {:8.2f} x'.format(old_time / new_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/python
+#
+# micro-benchmark: tool page rendering with compiled templates vs. re-reading string.Template per page
+#
+# usage: python bench/bench_templates.py [--tools 5000] [--params 12]
+#
+
+import os
+import sys
+import time
+import argparse
+
+from string import Template
+
+# run from repository root as templates are read from ./templates
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, '.')
+
+import parse_modules
+
+def synthetic_records(tools=None, params=None):
+    """ return list of tool records as written to the metadata store """
+    records = []
+    for i in range(tools):
+        parameters = {'Input' : [], 'Output' : [], 'Options' : []}
+        for n in range(params):
+            section = ['Input', 'Output', 'Options'][n % 3]
+            parameters[section].append(parse_modules.Parameter(
+                n,
+                'Parameter %d' % n,
+                'PARAM_%d' % n,
+                7,
+                'double',
+                'Floating point',
+                'description of parameter %d' % n,
+                'Floating point',
+                'Minimum: 0.0\nDefault: 1.0',
+                False,
+                section == 'Input',
+                section == 'Options',
+                n % 4 == 0,
+                section == 'Output',
+            ))
+        records.append({
+            'kind' : 'tool',
+            'fname' : 'libbench_%d.so' % (i // 50),
+            'lib_name' : 'bench_%d' % (i // 50),
+            'lib_title' : 'Bench - Library %d' % (i // 50),
+            'tool_id' : '%d' % (i % 50),
+            'tool_title' : 'Tool %d' % i,
+            'Saga_Cmd' : '<strong>saga_cmd bench_%d %d</strong> [-PARAM_0 &lt;double>]' % (i // 50, i % 50),
+            'details' : {
+                'Get_Author' : 'A. Author',
+                'Get_Description' : 'Tool %d\nwith two lines' % i,
+                'Get_Description_HTML' : 'Tool %d<br>with two lines' % i,
+                'Get_References' : '',
+                'Get_ID' : '%d' % (i % 50),
+                'Full_Menu_Path' : 'Bench|Library %d' % (i // 50),
+                'WIKI_Link' : None,
+                'Get_Parameters' : parameters,
+            },
+        })
+    return records
+
+class UncompiledTemplates():
+    """ previous rendering path: one module-global terms dict mutated in place, template re-read and parsed for every page """
+    def __init__(self):
+        self.TPL_TERMS = {}
+
+    def render(self, name=None, terms=None):
+        self.TPL_TERMS.update(terms)
+        s = Template(parse_modules.util.read_template('./templates/%s.tpl' % name))
+        return s.safe_substitute(self.TPL_TERMS)
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark tool page rendering.')
+    parser.add_argument('--tools', type=int, default=5000, help='number of synthetic tools')
+    parser.add_argument('--params', type=int, default=12, help='number of parameters per tool')
+    args = parser.parse_args()
+
+    records = synthetic_records(args.tools, args.params)
+    renderer = parse_modules.PageRenderer('0.0.0')
+
+    uncompiled = parse_modules.PageRenderer('0.0.0', templates=UncompiledTemplates())
+    start = time.perf_counter()
+    old_pages = [uncompiled.tool_page(record) for record in records]
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_pages = list(renderer.tool_pages(records))
+    new_time = time.perf_counter() - start
+
+    if old_pages != new_pages:
+        print('ERROR: compiled templates render different pages')
+        sys.exit(1)
+
+    print('{} tools, {} parameters each'.format(args.tools, args.params))
+    print('string.Template per page: {:8.3f} s {:10.0f} pages/s'.format(old_time, args.tools / old_time))
+    print('compiled templates:       {:8.3f} s {:10.0f} pages/s'.format(new_time, args.tools / new_time))
+    print('speedup:                  {:8.2f} x'.format(old_time / new_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+#
+# micro-benchmark: post-processing of saga_cmd usage output with the previous per-line regex loop vs. the compiled usage parser
+#
+# usage: python bench/bench_usage.py [--tools 2000] [--params 12] [--cache cache/saga_cmd_<version>.json] [--repeat 5]
+#
+# the corpus is the raw saga_cmd output captured in a usage cache file if given, else the saga_cmd outputs in bench/usage,
+# named <library>.<tool>.txt, and usage generated for tools of the stand-in saga_api in bench/fake, both variants have
+# to produce the same Saga_Cmd text
+#
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+
+# run from repository root, the stand-in saga_api is imported from bench/fake
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, '.')
+sys.path.insert(0, './bench/fake')
+
+import saga_api
+import parse_modules
+
+def previous_usage(lib_name=None, tool_id=None, out=None):
+    """ previous implementation: patterns formatted per line, then searched, substituted and escaped line by line """
+    usage = []
+    collect_usage = False
+    for line in out.split('\n'):
+        if line[:5] == "Usage":
+            collect_usage = True
+        if collect_usage:
+            if not re.search('saga_cmd %s %s' % (lib_name,tool_id), line):
+                line = re.sub("saga_cmd", "saga_cmd %s %s" % (lib_name,tool_id), line)
+            line = re.sub("<","&lt;", line)
+            line = re.sub('saga_cmd %s %s' % (lib_name,tool_id),'<strong>saga_cmd %s %s</strong>' % (lib_name,tool_id), line)
+            usage.append(line)
+    return '\n'.join(usage)
+
+def current_usage(lib_name=None, tool_id=None, out=None):
+    """ current implementation: one pass into a usage spec, text rendered from the spec """
+    spec = parse_modules.parse_usage(lib_name, tool_id, out)
+    return parse_modules.render_usage(spec) if spec else ''
+
+def load_corpus(args=None):
+    """ return list of (library, tool ID, saga_cmd output) """
+    corpus = []
+    if args.cache:
+        with open(args.cache) as f:
+            libraries = json.load(f)['libraries']
+        for lib_name in sorted(libraries):
+            for tool_id, entry in sorted(libraries[lib_name]['tools'].items()):
+                if entry.get('out'):
+                    corpus.append((lib_name, tool_id, entry['out']))
+        return corpus
+
+    # saga_cmd outputs of several SAGA versions, with switches, usage lines without library and tool and indented descriptions
+    for fpath in sorted(glob.glob('bench/usage/*.txt')):
+        lib_name, tool_id = os.path.basename(fpath)[:-len('.txt')].rsplit('.', 1)
+        with open(fpath) as f:
+            corpus.append((lib_name, tool_id, f.read()))
+
+    spec = {'name' : 'bench', 'params' : args.params}
+    for i in range(args.tools):
+        tool = saga_api.CSG_Tool(spec, i)
+        out, err = parse_modules.util.get_native_usage('bench', str(i), parse_modules.util.parse_parameters(tool))
+        corpus.append(('bench', str(i), 'SAGA Version: %s\n\n' % saga_api.VERSION + out))
+    return corpus
+
+def measure(process=None, corpus=None, repeat=None):
+    """ return best seconds per tool of process() over the corpus """
+    best = None
+    for n in range(repeat):
+        start = time.perf_counter()
+        for lib_name, tool_id, out in corpus:
+            process(lib_name, tool_id, out)
+        seconds = (time.perf_counter() - start) / len(corpus)
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark saga_cmd usage post-processing.')
+    parser.add_argument('--tools', type=int, default=2000, help='number of synthetic tools')
+    parser.add_argument('--params', type=int, default=12, help='number of parameters per tool')
+    parser.add_argument('--cache', help='usage cache file with captured saga_cmd output, e.g. cache/saga_cmd_9.1.0.json')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs, the best one counts')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    if not corpus:
+        print('ERROR: empty corpus')
+        sys.exit(1)
+
+    # both variants have to produce the same text, outputs the parser does not understand are listed
+    differ = 0
+    for lib_name, tool_id, out in corpus:
+        if previous_usage(lib_name, tool_id, out) != current_usage(lib_name, tool_id, out):
+            differ += 1
+            if differ <= 3:
+                print('differs: saga_cmd {} {}'.format(lib_name, tool_id))
+
+    old_time = measure(previous_usage, corpus, args.repeat)
+    new_time = measure(current_usage, corpus, args.repeat)
+
+    print('{} usage outputs, {} differ'.format(len(corpus), differ))
+    print('previous: {:8.1f} us/tool'.format(old_time * 1e6))
+    print('current:  {:8.1f} us/tool'.format(new_time * 1e6))
+    print('speedup:  {:8.2f} x'.format(old_time / new_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python
+#
+# consistency check: builds against the stand-in saga_api and saga_cmd in bench/fake with a library that fails while parsing
+#
+# usage: python bench/check_build.py [--cmd-latency 0.02] [-- parse_modules.py options]
+#
+# the library "raiser" raises in Get_Tool() for its third tool, the build has to log the failure and leave out every
+# page and record of the library, serial and with worker processes
+#
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_build import create_workdir, run_build
+
+def create_libraries(libpath=None):
+    """ write two good libraries and one raising in Get_Tool() """
+    os.makedirs(libpath)
+    for name, spec in (('good_a', {}), ('good_b', {}), ('raiser', {'raise_tool' : 2})):
+        spec.update({'tools' : 6, 'params' : 6})
+        with open(os.path.join(libpath, 'lib%s.so' % name), 'w') as f:
+            json.dump(spec, f)
+
+def find_library(workdir=None, lib_name=None):
+    """ return the files of the build that mention the library """
+    found = []
+    html_path = os.path.join(workdir, 'html', '9.9.0')
+    for fname in os.listdir(html_path):
+        if fname.startswith(lib_name):
+            found.append(fname)
+    for fpath in [
+        os.path.join(workdir, 'store', 'tooldoc.jsonl'),
+        os.path.join(workdir, 'store', 'saga_cmd-9.9.0.json'),
+        os.path.join(html_path, 'search', 'tools.json'),
+        os.path.join(html_path, 'facets.json'),
+        os.path.join(html_path, 'a2z.html'),
+        os.path.join(html_path, 'index.html'),
+    ]:
+        with open(fpath) as f:
+            if lib_name in f.read():
+                found.append(os.path.relpath(fpath, workdir))
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description='check builds with a failing library.')
+    parser.add_argument('--cmd-latency', type=float, default=0.02, help='seconds per saga_cmd call (default: 0.02)')
+    parser.add_argument('--keep', action='store_true', help='keep the temporary build directories')
+    parser.add_argument('options', nargs='*', help='options passed to parse_modules.py after --')
+    args = parser.parse_args()
+
+    failed = 0
+    for options in ([], ['--processes', '2']):
+        tmp = tempfile.mkdtemp(prefix='check_build_')
+        try:
+            libpath = os.path.join(tmp, 'libs')
+            workdir = os.path.join(tmp, 'work')
+            create_libraries(libpath)
+            create_workdir(workdir)
+            seconds, peak, returncode = run_build(workdir, libpath, args.options + options, args.cmd_latency, 0.0)
+            with open(os.path.join(workdir, 'error_log.txt')) as f:
+                is_logged = 'parsing library libraiser.so failed' in f.read()
+            found = find_library(workdir, 'raiser') if returncode == 0 else []
+            name = ' '.join(options) or 'serial'
+            if returncode:
+                print('ERROR: {} build failed, see {}/build.log'.format(name, workdir))
+            elif not is_logged or found:
+                print('ERROR: {} build {}{}'.format(name, '' if is_logged else 'did not log the failed library ', ', '.join(found)))
+            else:
+                print('{}: failed library logged and left out'.format(name))
+                continue
+            failed += 1
+            args.keep = True
+        finally:
+            if args.keep:
+                print('kept {}'.format(tmp))
+            else:
+                shutil.rmtree(tmp)
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
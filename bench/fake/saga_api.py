@@ -0,0 +1,265 @@
+#!/usr/bin/python
+#
+# stand-in for the SWIG generated saga_api module, for benchmarks on machines without SAGA
+#
+# a tool library is a JSON file named lib<name>.so, e.g. {"tools": 50, "params": 12}, optional keys:
+#   name, title, category   library name (default: from file name), title and category
+#   seed                    seed for the generated parameters
+#   broken_tool             tool ID for which saga_cmd fails
+#   silent_tool             tool ID for which saga_cmd prints no usage
+#   raise_tool              tool ID for which Get_Tool() raises like a SWIG type error
+#   crash                   Add_Library() kills the process with SIGSEGV
+#
+# environment: FAKE_SAGA_VERSION (default 9.9.0), FAKE_SAGA_LOAD_LATENCY (seconds per Add_Library)
+#
+
+import os
+import json
+import time
+import random
+import signal
+
+VERSION = os.environ.get('FAKE_SAGA_VERSION', '9.9.0')
+
+# parameter types as (ID, identifier, name, kind), kind data is an input or output, everything else an option
+TYPES = [
+    (1, 'boolean', 'Boolean', 'option'),
+    (2, 'integer', 'Integer', 'option'),
+    (3, 'double', 'Floating point', 'option'),
+    (6, 'choice', 'Choice', 'option'),
+    (7, 'text', 'Text', 'option'),
+    (14, 'grid_system', 'Grid system', 'option'),
+    (15, 'grid', 'Grid', 'data'),
+    (17, 'table', 'Table', 'data'),
+    (18, 'shapes', 'Shapes', 'data'),
+    (19, 'tin', 'TIN', 'data'),
+    (20, 'points', 'Point Cloud', 'data'),
+]
+
+def SAGA_API_Get_Version():
+    """ return version string like the real API """
+    return 'SAGA Application Programming Interface - Version: %s' % VERSION
+
+def lib_spec(fpath=None):
+    """ read library spec from file """
+    with open(fpath) as f:
+        spec = json.load(f)
+    spec.setdefault('name', os.path.basename(fpath)[3:-3])
+    return spec
+
+def tool_params(spec=None, tool_id=None):
+    """ return reproducible parameter dictionaries of a tool, shared with the fake saga_cmd """
+    rnd = random.Random('%s/%s/%s' % (spec['name'], tool_id, spec.get('seed', 0)))
+    params = []
+    for k in range(spec.get('params', 8)):
+        type_id, identifier, name, kind = TYPES[rnd.randrange(len(TYPES))]
+        param = {
+            'type' : type_id,
+            'type_id' : identifier,
+            'type_name' : name,
+            'id' : '%s_%d' % (identifier.upper(), k),
+            'name' : '%s %d' % (name, k),
+            'desc' : 'description of %s %d' % (name.lower(), k),
+        }
+        if kind == 'data':
+            param['dir'] = rnd.choice(['input', 'input', 'output'])
+            param['optional'] = rnd.random() < 0.3
+            param['desc2'] = '%s (%s%s)' % (name, 'optional ' if param['optional'] else '', param['dir'])
+            param['desc8'] = ''
+        else:
+            param['dir'] = 'option'
+            param['optional'] = False
+            param['desc2'] = name
+            if type_id == 6:
+                param['desc8'] = 'Available Choices:\n[0] first\n[1] second\n[2] third\nDefault: 0'
+            elif type_id in (2, 3):
+                param['desc8'] = 'Minimum: 0\nDefault: %s' % (rnd.randint(1, 9) if type_id == 2 else '%.6f' % rnd.random())
+            elif type_id == 1:
+                param['desc8'] = 'Default: 1'
+            else:
+                param['desc8'] = ''
+        params.append(param)
+    return params
+
+class CSG_String():
+    """ string wrapper """
+    def __init__(self, s=None):
+        self.s = s
+
+    def c_str(self):
+        return self.s
+
+class CSG_Strings():
+    """ string list wrapper """
+    def __init__(self, strings=None):
+        self.strings = strings
+
+    def Get_Count(self):
+        return len(self.strings)
+
+    def Get_String(self, i=None):
+        return CSG_String(self.strings[i])
+
+class CSG_Parameter():
+    """ tool parameter """
+    def __init__(self, param=None):
+        self.param = param
+
+    def is_Input(self):
+        return self.param['dir'] == 'input'
+
+    def is_Output(self):
+        return self.param['dir'] == 'output'
+
+    def is_Option(self):
+        return self.param['dir'] == 'option'
+
+    def is_Information(self):
+        return False
+
+    def is_Optional(self):
+        return self.param['optional']
+
+    def Get_Type(self):
+        return self.param['type']
+
+    def Get_Name(self):
+        return self.param['name']
+
+    def Get_Identifier(self):
+        return self.param['id']
+
+    def Get_Type_Identifier(self):
+        return CSG_String(self.param['type_id'])
+
+    def Get_Type_Name(self):
+        return CSG_String(self.param['type_name'])
+
+    def Get_Description(self, flags=None):
+        """ plain description without flags, type (2) or properties (8) description otherwise """
+        if flags is None:
+            return self.param['desc']
+        return CSG_String(self.param['desc2'] if flags == 2 else self.param['desc8'])
+
+class CSG_Parameters():
+    """ parameter list of a tool """
+    def __init__(self, params=None):
+        self.params = params
+
+    def Get_Count(self):
+        return len(self.params)
+
+    def Get_Parameter(self, i=None):
+        return CSG_Parameter(self.params[i])
+
+class CSG_Tool():
+    """ tool, every 7th is interactive and every 11th needs the GUI """
+    def __init__(self, spec=None, i=None):
+        self.spec = spec
+        self.i = i
+        self.params = tool_params(spec, i)
+
+    def Get_ID(self):
+        return CSG_String(str(self.i))
+
+    def Get_Name(self):
+        return CSG_String('%s Tool %d' % (self.spec['name'].title(), self.i))
+
+    def Get_Author(self):
+        return CSG_String('A. Author (c) 2020')
+
+    def Get_Description(self):
+        return CSG_String('Tool %d of %s.\nSecond line with <b>markup</b>.' % (self.i, self.spec['name']))
+
+    def Get_References(self):
+        return CSG_Strings(['Reference %d' % self.i] if self.i % 2 else [])
+
+    def Get_MenuPath(self):
+        return CSG_String(['', 'R:Sub', 'A:Other|Menu'][self.i % 3])
+
+    def Get_Parameters(self):
+        return CSG_Parameters(self.params)
+
+    def Get_Parameters_Count(self):
+        return 0
+
+    def Get_Type(self):
+        return 0
+
+    def is_Grid(self):
+        return False
+
+    def is_Interactive(self):
+        return self.i % 7 == 6
+
+    def needs_GUI(self):
+        return self.i % 11 == 10
+
+    def Destroy(self):
+        pass
+
+class CSG_Tool_Library():
+    """ tool library described by a spec file """
+    def __init__(self, fpath=None):
+        self.fpath = fpath
+        self.spec = lib_spec(fpath)
+
+    def Get_Category(self):
+        return CSG_String(self.spec.get('category', 'Fake'))
+
+    def Get_Name(self):
+        return CSG_String(self.spec.get('title', self.spec['name'].title()))
+
+    def Get_Author(self):
+        return CSG_String('Fake Authors')
+
+    def Get_Count(self):
+        return self.spec.get('tools', 5)
+
+    def Get_Description(self):
+        return CSG_String('Library %s' % self.spec['name'])
+
+    def Get_File_Name(self):
+        return CSG_String(self.fpath)
+
+    def Get_Library_Name(self):
+        return CSG_String(self.spec['name'])
+
+    def Get_Menu(self):
+        return CSG_String('Fake|%s' % self.spec['name'])
+
+    def Get_Version(self):
+        return CSG_String('1.0')
+
+    def is_Valid(self):
+        return True
+
+    def Get_Tool(self, i=None):
+        if self.spec.get('raise_tool') == i:
+            raise TypeError('in method Get_Tool, argument 2 of type int')
+        return CSG_Tool(self.spec, i)
+
+class CSG_Tool_Library_Manager():
+    """ library manager holding the loaded libraries """
+    def __init__(self):
+        self.libs = []
+
+    def Add_Library(self, fpath=None):
+        spec = lib_spec(fpath)
+        if spec.get('crash'):
+            os.kill(os.getpid(), signal.SIGSEGV)
+        time.sleep(float(os.environ.get('FAKE_SAGA_LOAD_LATENCY', '0')))
+        self.libs.append(CSG_Tool_Library(fpath))
+        return self.libs[-1]
+
+    def Get_Library(self, i=None):
+        return self.libs[i]
+
+    def Del_Library(self, i=None):
+        del self.libs[i]
+
+_manager = CSG_Tool_Library_Manager()
+
+def SG_Get_Tool_Library_Manager():
+    """ return the library manager """
+    return _manager
@@ -0,0 +1,49 @@
+/*****
+*
+* show debug JSON sidecars of pages built with --debugjson on demand
+*
+* a click on a link with class debugJson fetches the file once and toggles it in the <pre> element
+* following the link, without JavaScript the link opens the file itself
+*
+*****/
+
+window.addEventListener("load", function () {
+    var links, i;
+
+    function toggle(evt) {
+        var link, pre;
+        link = evt.currentTarget;
+        pre = link.parentNode.nextElementSibling;
+        if (!window.fetch || !pre || pre.nodeName !== 'PRE') {
+            // let the browser open the file
+            return;
+        }
+        evt.preventDefault();
+        if (link.getAttribute("data-loaded")) {
+            pre.hidden = !pre.hidden;
+            return;
+        }
+        pre.textContent = "loading " + link.getAttribute("href") + " ...";
+        pre.hidden = false;
+        fetch(link.getAttribute("href")).then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.status + " " + response.statusText);
+            }
+            return response.text();
+        }).then(function (text) {
+            pre.textContent = text;
+            link.setAttribute("data-loaded", "true");
+        }).catch(function (error) {
+            pre.textContent = "could not load " + link.getAttribute("href") + ": " + error.message;
+        });
+    }
+
+    // the script is included once per debug link, bind each link only once
+    links = document.getElementsByTagName("a");
+    for (i = 0; i < links.length; i += 1) {
+        if (links.item(i).getAttribute("class") === 'debugJson' && !links.item(i).getAttribute("data-bound")) {
+            links.item(i).setAttribute("data-bound", "true");
+            links.item(i).addEventListener("click", toggle, false);
+        }
+    }
+}, false);
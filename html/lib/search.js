@@ -0,0 +1,175 @@
+/*****
+*
+* simple tool search on the prebuilt index in search/
+*
+* search/tools.json lists the tools and the names of all shards, search/<prefix>.json maps the terms
+* starting with a two character prefix to [tool number, weight, ...] lists, only the shards of the
+* typed words are fetched
+*
+*****/
+
+window.addEventListener("load", function () {
+    var input, results, tools, shardNames, shards, timer, maxResults;
+
+    input = document.getElementById("search");
+    results = document.getElementById("search-results");
+    if (!input || !results || !window.fetch) {
+        return;
+    }
+    input.parentNode.style.display = "block";
+    tools = null;
+    shardNames = null;
+    shards = {};
+    timer = null;
+    maxResults = 50;
+
+    // file name of the shard of a word, same as SearchIndex.get_shard_name() in parse_modules.py
+    function shardName(word) {
+        var name, i, c, code;
+        name = "";
+        for (i = 0; i < word.length; i += 1) {
+            c = word.charAt(i);
+            if ((c >= "a" && c <= "z") || (c >= "0" && c <= "9")) {
+                name += c;
+            } else {
+                code = word.codePointAt(i);
+                name += "_" + code.toString(16);
+                if (code > 0xffff) {
+                    i += 1;
+                }
+            }
+        }
+        return name;
+    }
+
+    // first two characters of a word, surrogate pairs count as one character
+    function prefix(word) {
+        return Array.from(word).slice(0, 2).join("");
+    }
+
+    function getJSON(url) {
+        return fetch(url).then(function (response) {
+            if (!response.ok) {
+                throw new Error(url + ": " + response.status);
+            }
+            return response.json();
+        });
+    }
+
+    function loadTools() {
+        if (!tools) {
+            tools = getJSON("search/tools.json").then(function (data) {
+                shardNames = {};
+                data.shards.forEach(function (name) {
+                    shardNames[name] = true;
+                });
+                return data.tools;
+            });
+        }
+        return tools;
+    }
+
+    function loadShard(name) {
+        if (!shardNames[name]) {
+            return Promise.resolve({});
+        }
+        if (!shards[name]) {
+            shards[name] = getJSON("search/" + name + ".json");
+        }
+        return shards[name];
+    }
+
+    // best weight per tool of all terms starting with word
+    function match(shard, word) {
+        var scores, term, postings, i;
+        scores = {};
+        for (term in shard) {
+            if (term.lastIndexOf(word, 0) === 0) {
+                postings = shard[term];
+                for (i = 0; i < postings.length; i += 2) {
+                    // exact terms count twice
+                    scores[postings[i]] = Math.max(scores[postings[i]] || 0, postings[i + 1] * (term === word ? 2 : 1));
+                }
+            }
+        }
+        return scores;
+    }
+
+    function show(list, query) {
+        var html, i, tool;
+        if (list === null) {
+            results.innerHTML = "";
+            return;
+        }
+        if (list.length === 0) {
+            results.innerHTML = "<li>no tools found</li>";
+            return;
+        }
+        html = [];
+        for (i = 0; i < list.length && i < maxResults; i += 1) {
+            tool = list[i];
+            html.push('<li><a href="' + tool[1] + '">' + tool[0] + '</a> <span class="menuPath">' + tool[2] + (tool[3] ? ' | ' + tool[3] : '') + '</span></li>');
+        }
+        if (list.length > maxResults) {
+            html.push("<li>" + (list.length - maxResults) + " more tools, refine your search</li>");
+        }
+        results.innerHTML = html.join("");
+    }
+
+    // all words have to match at the start of a term, tools are ranked by the sum of their best weights
+    function search() {
+        var query, words;
+        query = input.value;
+        // letters, digits and underscores, the same words as \w in SearchIndex.add_terms() in parse_modules.py
+        words = query.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+        words = words.filter(function (word) {
+            return Array.from(word).length >= 2;
+        });
+        if (words.length === 0) {
+            show(null);
+            return;
+        }
+        loadTools().then(function (toolList) {
+            return Promise.all(words.map(function (word) {
+                return loadShard(shardName(prefix(word)));
+            })).then(function (loaded) {
+                var totals, i, scores, tool, ranked;
+                if (input.value !== query) {
+                    // outdated by further typing
+                    return;
+                }
+                totals = null;
+                for (i = 0; i < words.length; i += 1) {
+                    scores = match(loaded[i], words[i]);
+                    if (totals === null) {
+                        totals = scores;
+                    } else {
+                        for (tool in totals) {
+                            if (scores[tool] === undefined) {
+                                delete totals[tool];
+                            } else {
+                                totals[tool] += scores[tool];
+                            }
+                        }
+                    }
+                }
+                ranked = Object.keys(totals).sort(function (a, b) {
+                    return (totals[b] - totals[a]) || (toolList[a][0] < toolList[b][0] ? -1 : 1);
+                });
+                show(ranked.map(function (tool) {
+                    return toolList[tool];
+                }), query);
+            });
+        }).catch(function (error) {
+            results.innerHTML = "<li>search index not available</li>";
+        });
+    }
+
+    input.addEventListener("input", function () {
+        clearTimeout(timer);
+        timer = setTimeout(search, 150);
+    }, false);
+    if (input.value) {
+        search();
+    }
+}, false);
@@ -2,87 +2,88 @@
 *
 * simple table sort
 *
+* cells of sortable columns carry their precomputed sort rank in a data-rank attribute, rows are
+* placed by rank and moved in a single DOM update; columns without ranks are sorted by cell text
+*
 *****/
 
 window.addEventListener("load", function () {
-    var Sortable, tables, i, rows, cols, n;
+    var Sortable, tables, i, s;
 
     // the tool that does the work
     Sortable = function () { }
     Sortable.prototype.init = function (table) {
-        var lastHeader, rows;
-
-        // remember last header clicked for detecting reverse sort ...
-        lastHeader = null;
+        var rows, header;
 
         // activate sorting when the user clicks on header cells
-        rows = table.getElementsByTagName("tr");
-        rows.item(0).onclick = function (evt) {
+        rows = table.rows;
+        header = rows.item(0);
+        header.onclick = function (evt) {
             if (evt.target.nodeName === 'TR') {
                 // do nothing if the user clicks on borders of the row
                 return;
             }
-            var sortObj, i, j, n, key_parts, key_comp;
-            sortObj = {
-                header : rows.item(0).childNodes,
-                keys : [],
-                vals : {}
-            }
-            for (i = 0; i < sortObj.header.length; i += 1) {
-                if (evt.target === sortObj.header.item(i)) {
+            var cells, column, i, lastSorted, ascending, body, sorted, rank, keys, fragment;
+            cells = header.cells;
+            column = -1;
+            for (i = 0; i < cells.length; i += 1) {
+                if (evt.target === cells.item(i)) {
                     // set sort direction for this column
+                    column = i;
                     if (evt.target.hasAttribute("class")) {
                         lastSorted = evt.target.getAttribute("class");
                         evt.target.setAttribute("class", (lastSorted === 'sorted-asc') ? 'sorted-desc' : 'sorted-asc');
                     } else {
                         evt.target.setAttribute("class", 'sorted-asc');
                     }
-
-                    // sort remaining rows
-                    for (j = 1; j < rows.length; j += 1) {
-                        // loop through columns of row, define a compound key and its values
-                        cols = rows.item(j).childNodes;
-                        key_parts = [];
-                        for (n = 0; n < cols.length; n += 1) {
-                            if (n !== i) {
-                                // add column to the end
-                                key_parts.push(cols.item(n).innerHTML);
-                            } else {
-                                // add it to the beginning (that makes it sort)
-                                key_parts.unshift(cols.item(n).innerHTML);
-                            }
-                        }
-                        // add unique identifier to the key parts
-                        key_parts.push(j);
-
-                        // join key parts and strip HTML tags
-                        key_comp = key_parts.join(" ").replace(/<[^>]+>/g,"")
-
-                        // remember keys and values
-                        sortObj.keys.push(key_comp);
-                        sortObj.vals[key_comp] = '<tr>' + rows.item(j).innerHTML + '</tr>';
-                    }
                 } else {
                     // reset sort direction for remaining columns
-                    sortObj.header.item(i).removeAttribute("class");
+                    cells.item(i).removeAttribute("class");
+                }
+            }
+            if (column < 0 || rows.length < 2) {
+                return;
+            }
+            ascending = evt.target.getAttribute("class") === 'sorted-asc';
+
+            // place remaining rows by rank of the clicked column
+            body = rows.item(1).parentNode;
+            sorted = [];
+            for (i = 1; i < rows.length; i += 1) {
+                rank = rows.item(i).cells.item(column).getAttribute("data-rank");
+                if (rank === null) {
+                    sorted = null;
+                    break;
                 }
+                sorted[parseInt(rank, 10)] = rows.item(i);
             }
 
-            // sort list of compound keys ASC or DESC
-            if (evt.target.hasAttribute("class")) {
-                if (evt.target.getAttribute("class") === 'sorted-asc') {
-                    sortObj.keys.sort();
-                } else {
-                    sortObj.keys.sort().reverse();
+            // no ranks, sort by cell text and keep the current order of equal cells
+            if (sorted === null) {
+                sorted = [];
+                keys = [];
+                for (i = 1; i < rows.length; i += 1) {
+                    sorted.push(rows.item(i));
+                    keys.push(rows.item(i).cells.item(column).textContent);
                 }
-            } else {
-                sortObj.keys.sort();
+                sorted = sorted.map(function (row, n) {
+                    return n;
+                }).sort(function (a, b) {
+                    return (keys[a] < keys[b]) ? -1 : (keys[a] > keys[b]) ? 1 : a - b;
+                }).map(function (n) {
+                    return sorted[n];
+                });
+            }
+            if (!ascending) {
+                sorted.reverse();
             }
 
-            // update remaining rows with sorted content
-            for (i = 1; i < rows.length; i += 1) {
-                rows.item(i).innerHTML = sortObj.vals[sortObj.keys[i - 1]];
+            // move all rows at once
+            fragment = document.createDocumentFragment();
+            for (i = 0; i < sorted.length; i += 1) {
+                fragment.appendChild(sorted[i]);
             }
+            body.appendChild(fragment);
         };
     };
 
@@ -8,7 +8,8 @@ import os
 if os.name == 'nt': # Windows
     if os.getenv('SAGA_PATH') is None:
         os.environ['SAGA_PATH'] = 'C:/develop/saga'                                     # SAGA installation path
-    os.add_dll_directory(os.environ['SAGA_PATH'])
+    if os.path.isdir(os.environ['SAGA_PATH']):
+        os.add_dll_directory(os.environ['SAGA_PATH'])
     os.environ['SAGA_TLB'  ] = os.environ['SAGA_PATH'] + os.sep + 'tools'               # SAGA tool libraries path
     os.environ['PATH'      ] = os.environ['SAGA_PATH'] + os.sep +    ';' + os.environ['PATH']
     os.environ['PATH'      ] = os.environ['SAGA_PATH'] + os.sep + 'dll;' + os.environ['PATH']
@@ -17,19 +18,69 @@ import re
 import argparse
 import json as simplejson
 import subprocess
-import saga_api
 import shutil
+import hashlib
+import multiprocessing
+import multiprocessing.connection
+import traceback
+import difflib
+import filecmp
+import zlib
+import gzip
+import importlib.util
+import http.server
+import functools
+import sys
+import time
+import threading
+
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait as wait_futures
 
 from string import Template
+from types import MappingProxyType, GeneratorType
 
 HTML_PATH = './html'
-TPL_TERMS = {}
+TEMPLATE_PATH = './templates'
+CACHE_PATH = './cache'
+STORE_PATH = './store/tooldoc.jsonl'
+OBJECTS_PATH = './html/.objects'
+
+# files that get precompressed siblings with --compress
+COMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.json', '.jsonl')
+
+# metadata store layout, stores of other formats are neither reused nor rendered
+STORE_FORMAT = 4
+
+# saga_cmd usage output: the usage line, the options listed in it, the flag line of an option and its property lines,
+# switches like [-SELECT] have no value type
+USAGE_LINE = re.compile(r'^Usage: saga_cmd(?: (?P<library>[^\s\[-]\S*) (?P<tool>[^\s\[-]\S*))?(?P<options>.*)$')
+USAGE_OPTION = re.compile(r'(?P<optional>\[)?-(?P<identifier>[^\s:<\[\]]+)(?: <(?P<type>[^>]*)>)?\]?')
+USAGE_FLAG = re.compile(r'^\s+-(?P<identifier>[^\s:<]+)(?::<(?P<type>[^>]*)>)?(?:\s+(?P<name>.*))?$')
+USAGE_PROPERTY = re.compile(r'^(?P<key>Default|Minimum|Maximum): ?(?P<value>.*)$')
+USAGE_CHOICE = re.compile(r'^\[(?P<value>[^\]]*)\] ?(?P<label>.*)$')
+
+# compact parameter record, field names are the keys of the former parameter dictionaries
+Parameter = namedtuple('Parameter', [
+    'index', 'Get_Name', 'Get_Identifier', 'Get_Type', 'Get_Type_Identifier', 'Get_Type_Name',
+    'Get_Description', 'Get_Description_2', 'Get_Description_8',
+    'is_Information', 'is_Input', 'is_Option', 'is_Optional', 'is_Output',
+])
+
+# imported on demand, rendering from the metadata store works without SAGA
+saga_api = None
+
+def import_saga_api():
+    """ import the SAGA Python API """
+    global saga_api
+    import saga_api
 
 class Util():
     """ utility functions """
     def __init__(self):
         """ initialize utility class """
-        pass
+        self.type_strings = {}
 
     def get_saga_version(self):
         """ return version number of current SAGA-API """
@@ -46,11 +97,12 @@ class Util():
     def cstr_2_str(self, value=None):
         """ return SWIG c_str value as Python str """
         if value:
-            if type(value.c_str()) == str:
-                return value.c_str()
+            s = value.c_str()
+            if type(s) == str:
+                return s
             else:
-                print (type(value.c_str()))
-                return value.c_str().encode('utf8')
+                print (type(s))
+                return s.encode('utf8')
         else:
             return ''
 
@@ -77,6 +129,32 @@ class Util():
         o.close()
         return links
 
+    def get_fingerprint(self, fpath=None):
+        """ return size, modification time and SHA1 content hash of the given file """
+        stat = os.stat(fpath)
+        return {
+            'size' : stat.st_size,
+            'mtime' : int(stat.st_mtime),
+            'sha1' : self.get_sha1(fpath),
+        }
+
+    def get_sha1(self, fpath=None):
+        """ return SHA1 content hash of the given file """
+        sha1 = hashlib.sha1()
+        with open(fpath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def get_build_key(self, version=None, debugjson=False, usage=None, shared=False):
+        """ return hash over everything besides the libraries that ends up in generated pages, usage is the --usage mode of the
+            saga_cmd text and shared is set for pages without version of --dedup builds
+        """
+        sha1 = hashlib.sha1(('%s %s %s %s' % (version, debugjson, usage, shared)).encode('utf8'))
+        for fpath in (TEMPLATE_PATH + '/tool.tpl', TEMPLATE_PATH + '/library.tpl', 'wikilinks.txt'):
+            sha1.update(self.read_template(fpath).encode('utf8'))
+        return sha1.hexdigest()
+
     def lib_name_from_so(self, name=None):
         """ strip optional path info, lib prefix and .so extenstion
             /usr/local/lib/saga/contrib_a_perego.so results in contrib_a_perego
@@ -88,18 +166,25 @@ class Util():
             return '%s' % name.split('/')[-1][3:][:-3]
 
     def parse_parameters(self, tool_obj=None):
-        """ parse SAGA parameters object and create python dictionary
+        """ parse SAGA parameters object into compact Parameter records by section
             see http://www.saga-gis.org/saga_api_doc/html/module_8cpp_source.html#l00928 (CSG_Module::Get_Summary)
+            the parameters object is fetched once, every SWIG getter is called once per parameter
+            and type identifier and name are looked up once per parameter type
         """
         params = {}
-        for n in range(0, tool_obj.Get_Parameters().Get_Count()):
-            param = tool_obj.Get_Parameters().Get_Parameter(n)
+        parameters = tool_obj.Get_Parameters()
+        for n in range(0, parameters.Get_Count()):
+            param = parameters.Get_Parameter(n)
+            is_input = param.is_Input()
+            is_output = param.is_Output()
+            is_option = param.is_Option()
+            param_type_id = param.Get_Type()
             param_type = ""
-            if param.is_Input():
+            if is_input:
                 param_type = "Input"
-            elif param.is_Output():
+            elif is_output:
                 param_type = "Output"
-            elif param.is_Option() and param.Get_Type() != 14:  #PARAMETER_TYPE_Grid_System
+            elif is_option and param_type_id != 14:  #PARAMETER_TYPE_Grid_System
                 param_type = "Options"
             else:
                 continue
@@ -108,24 +193,86 @@ class Util():
             if not param_type in params:
                 params[param_type] = []
 
+            # type identifier and name only depend on the parameter type
+            if not param_type_id in self.type_strings:
+                self.type_strings[param_type_id] = (
+                    self.cstr_2_str(param.Get_Type_Identifier()),
+                    self.cstr_2_str(param.Get_Type_Name())
+                )
+            type_identifier, type_name = self.type_strings[param_type_id]
+
             # see dir(tool_obj.Get_Parameters().Get_Parameter(0))
-            params[param_type].append({
-                'Get_Name' : param.Get_Name(),
-                'Get_Identifier' : param.Get_Identifier(),
-                'Get_Type' : param.Get_Type(),
-                'Get_Type_Identifier' : self.cstr_2_str(param.Get_Type_Identifier()),
-                'Get_Type_Name' : self.cstr_2_str(param.Get_Type_Name()),
-                'Get_Description' : param.Get_Description(),
-                'Get_Description_2' : self.cstr_2_str(param.Get_Description(2)),  #PARAMETER_DESCRIPTION_TYPE
-                'Get_Description_8' : self.cstr_2_str(param.Get_Description(8)),  #PARAMETER_DESCRIPTION_PROPERTIES
-                'is_Information' : param.is_Information(),
-                'is_Input' : param.is_Input(),
-                'is_Option' : param.is_Option(),
-                'is_Optional' : param.is_Optional(),
-                'is_Output' : param.is_Output(),
-            })
+            params[param_type].append(Parameter(
+                n,    # position in the tool's parameter list
+                param.Get_Name(),
+                param.Get_Identifier(),
+                param_type_id,
+                type_identifier,
+                type_name,
+                param.Get_Description(),
+                self.cstr_2_str(param.Get_Description(2)),  #PARAMETER_DESCRIPTION_TYPE
+                self.cstr_2_str(param.Get_Description(8)),  #PARAMETER_DESCRIPTION_PROPERTIES
+                param.is_Information(),
+                is_input,
+                is_option,
+                param.is_Optional(),
+                is_output,
+            ))
         return params
 
+    def expand_parameters(self, details=None):
+        """ return copy of tool details with parameters as dictionaries, as shown in debug JSON """
+        details = dict(details)
+        details['Get_Parameters'] = dict(
+            (section, [Parameter._make(param)._asdict() for param in params]) for section, params in details['Get_Parameters'].items()
+        )
+        return details
+
+    def run_saga_cmd(self, lib_name=None, tool_id=None, timeout=None):
+        """ call saga_cmd for the given tool and return tuple (stdout, stderr) - safe to run in worker threads
+            raises subprocess.TimeoutExpired after killing saga_cmd if it runs longer than timeout seconds
+        """
+        proc = subprocess.Popen(['saga_cmd', lib_name, tool_id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        try:
+            return proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+
+    def get_native_usage(self, lib_name=None, tool_id=None, parameters=None, needs_GUI=False):
+        """ build saga_cmd usage from parsed parameters and return tuple (stdout, stderr) as saga_cmd would
+            mandatory inputs are listed without brackets, integers as <num>, floating point values as <double>, everything else as <str>
+        """
+        if needs_GUI:
+            return '', 'Error: tool needs graphical user interface\n'
+
+        params = []
+        for section in parameters:
+            params.extend(parameters[section])
+        params.sort(key=lambda param: param.index)
+
+        options = []
+        flags = []
+        for param in params:
+            value_type = {'integer' : 'num', 'double' : 'double', 'degree' : 'double'}.get(param.Get_Type_Identifier, 'str')
+            option = '-%s <%s>' % (param.Get_Identifier, value_type)
+            options.append(option if param.is_Input and not param.is_Optional else '[%s]' % option)
+            flags.append('-%s:<%s>' % (param.Get_Identifier, value_type))
+
+        lines = ['Usage: saga_cmd %s %s %s' % (lib_name, tool_id, ' '.join(options))]
+        width = max([len(flag) for flag in flags] or [0])
+        for flag, param in zip(flags, params):
+            lines.append('  %s\t%s' % (flag.ljust(width), param.Get_Name))
+            for line in [param.Get_Description_2] + param.Get_Description_8.split('\n'):
+                if line:
+                    lines.append('\t%s' % line)
+        return '\n'.join(lines) + '\n', ''
+
+    def is_sampled(self, key=None, percent=None):
+        """ return True for a stable subset of about the given percentage of keys """
+        return zlib.crc32(key.encode('utf8')) % 100 < percent
+
     def add_brs(self, s=None):
         """ replace \n with <br> in string """
         if s:
@@ -134,178 +281,520 @@ class Util():
             return s
 
     def as_json(self, obj=None):
-        """ return JSON string from object escaping "<" """
-        json = simplejson.dumps(obj, indent=True, sort_keys=True)
-        json = re.sub("<","&lt;",json)
-        return "<h3>Debug JSON</h3><pre class='usage'>%s</pre>" % json
-
-# parse commandline
-parser = argparse.ArgumentParser(description='import opendata for ooe application.')
-default_libpath = '/usr/local/lib/saga'
-if os.name == 'nt':
-    default_libpath = os.environ['SAGA_TLB']
-parser.add_argument('--libpath', dest='libpath', default=default_libpath, help='path to shared object library files')
-parser.add_argument('--lib', dest='lib', help='parse given library only')
-parser.add_argument('--tool', dest='tool', help='parse given tool only')
-parser.add_argument('--skip', dest='skip', help='skip libraries from beeing processed (e.g --skip imagery_classification,imagery_svm,geostatistics_kriging,ihacres)')
-parser.add_argument('--debugjson', dest='debugjson', action='store_true', help='add JSON dictionaries for debugging to HTML pages')
-args = parser.parse_args()
-
-has_errors = False
-has_debug = False
-error_log = open('error_log.txt','w')
-debug_log = open('debug_log.txt','w')
-
-libraries = {}
-a2z = {}
-
-# initialize utility class
-util = Util()
-
-# define wikilinks
-wikilinks = util.get_wikilinks()
-
-# make sure target directory with version number for docs exists
-HTML_PATH = "%s/%s" % (HTML_PATH,util.get_saga_version())
-if not os.path.exists(HTML_PATH):
-    os.mkdir(HTML_PATH)
-
-# add template term for version number
-TPL_TERMS['VERSION'] = util.get_saga_version()
-
-# add empty JSON debug template term
-TPL_TERMS['Debug_JSON'] = ''
-
-for fname in os.listdir(args.libpath):
-    # parse optional commandline options
-    if args.lib and util.lib_name_from_so(fname) != args.lib:
-        continue
-    if args.tool and not re.match(r'^%s_[0-9]+$' % util.lib_name_from_so(fname), args.tool):
-        continue
-        
-    if os.name == 'nt':
-        if fname[-4:] != '.dll':
-            continue
-    else:
-        if fname[-3:] != '.so':
-            continue
-
-    print('parsing {}/{} ...'.format(args.libpath,fname))
-
-    # load library
-    if args.skip and util.lib_name_from_so(fname) in args.skip.split(','):
-        print('SKIPPING library {} as requested ...'.format(util.lib_name_from_so(fname)))
-        continue
-    else:
-        saga_api.SG_Get_Tool_Library_Manager().Add_Library('%s/%s' % (args.libpath,fname))
-
-    # define shortcut to library object
-    lib_obj = saga_api.SG_Get_Tool_Library_Manager().Get_Library(0)
-
-    # define unique name for library
-    lib_name = ''
-    if os.name == 'nt':
-        lib_name = util.lib_name_from_so('%s' % fname)
-    else:
-        lib_name = util.lib_name_from_so('%s/%s' % (args.libpath,fname))
-
-    # define library title as we will use it more than once
-    lib_title = '%s - %s' % (util.cstr_2_str(lib_obj.Get_Category()),util.cstr_2_str(lib_obj.Get_Name()) )
-
-    # remember library details - see dir(lib_obj)
-    libraries[lib_title] = {
-        'Get_Author' : util.cstr_2_str(lib_obj.Get_Author()),
-        'Get_Count' : lib_obj.Get_Count(),
-        'Get_Description' : util.cstr_2_str(lib_obj.Get_Description()),
-        'Get_File_Name' : util.cstr_2_str(lib_obj.Get_File_Name()),
-        'Get_Library_Name' : util.cstr_2_str(lib_obj.Get_Library_Name()),
-        'Get_Menu' : util.cstr_2_str(lib_obj.Get_Menu()),
-        'Get_Name' : util.cstr_2_str(lib_obj.Get_Name()),
-        'Get_Version' : util.cstr_2_str(lib_obj.Get_Version()),
-        'is_Valid' : lib_obj.is_Valid(),
-        'doc_Links' : {},    # will be filled while parsing tools
-    }
-
-    # resolve WIKI link if any
-    if lib_name in wikilinks:
-        libraries[lib_title]['WIKI_Link'] = wikilinks[lib_name]
-    else:
-        libraries[lib_title]['WIKI_Link'] = None
-
-    # loop through library tools and collect details
-    for i in range(0,libraries[lib_title]['Get_Count']):
-        # load tool
-        tool_obj = lib_obj.Get_Tool(i)
-        tool_obj_id = tool_obj.Get_ID()
-
-        # make sure that tool is valid
-        if not 'Get_Name' in dir(tool_obj):
-            continue
-
-        # skip tool if needed
-        if args.tool and "%s_%s" % (lib_name, tool_obj_id.c_str()) != args.tool:
-            continue
+        """ return pretty printed JSON string of object """
+        return simplejson.dumps(obj, indent=True, sort_keys=True)
+
+    def iter_json(self, items=None):
+        """ yield the same JSON as as_json() for a dictionary given as (key, object) pairs in key order, one key at a time """
+        yield "{"
+        separator = '\n'
+        for key, obj in items:
+            # strip the braces around the single key dictionary, indentation is the same as in the full dictionary
+            json = simplejson.dumps({key : obj}, indent=True, sort_keys=True)
+            yield separator + json[2:-2]
+            separator = ',\n'
+        yield "%s}" % ('\n' if separator == ',\n' else '')
+
+    def debug_link(self, name=None):
+        """ return HTML of a link to the debug JSON sidecar debug/<name>.json, lib/debugjson.js shows it in the page on demand """
+        return (
+            "<h3>Debug JSON</h3><p><a class='debugJson' href='debug/%s.json'>debug/%s.json</a></p><pre class='usage' hidden></pre>"
+            "<script src='./lib/debugjson.js'></script>" % (name, name)
+        )
 
-        # remember tool details - see dir(tool_obj)
-        #print "DEBUG: %s_%s" % (lib_name, tool_obj_id.c_str())
-        details = {
-            'Get_Author' : util.cstr_2_str(tool_obj.Get_Author()),
-            'Get_Description' : util.cstr_2_str(tool_obj.Get_Description()),
-            'Get_References' : util.toolreferences_2_str(tool_obj.Get_References()),
-            'Get_ID' : tool_obj.Get_ID(),
-            'Get_Icon' : tool_obj.Get_Icon(),
-            'Get_MenuPath' : util.cstr_2_str(tool_obj.Get_MenuPath()),
-            'Get_Name' : util.cstr_2_str(tool_obj.Get_Name()),
-            'Get_Parameters' : util.parse_parameters(tool_obj),
-            'Get_Parameters_Count' : tool_obj.Get_Parameters_Count(),
-            'Get_Type' : tool_obj.Get_Type(),
-            'is_Grid' : tool_obj.is_Grid(),
-            'is_Interactive' : tool_obj.is_Interactive(),
-            'needs_GUI' : False if not hasattr(tool_obj,'needs_GUI') else tool_obj.needs_GUI()    # introduced in https://sourceforge.net/p/saga-gis/code-0/2111/
+class Profiler():
+    """ time build phases per library and tool, thread safe and cheap enough to stay on in nightly builds
+        keeps the durations of each phase for percentiles and total seconds by library and by tool for the slowest lists
+    """
+    def __init__(self):
+        """ start disabled with no samples """
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """ forget all samples """
+        self.durations = {}
+        self.libraries = {}
+        self.tools = {}
+
+    def stop(self, phase=None, start=None, library=None, tool=None):
+        """ record the time since start, a time.perf_counter() value, for phase and add it to the totals of library or tool """
+        if not self.enabled:
+            return
+        seconds = time.perf_counter() - start
+        with self.lock:
+            if not phase in self.durations:
+                self.durations[phase] = array('d')
+            self.durations[phase].append(seconds)
+            if library:
+                self.libraries[library] = self.libraries.get(library, 0.0) + seconds
+            if tool:
+                self.tools[tool] = self.tools.get(tool, 0.0) + seconds
+
+    def collect(self):
+        """ return samples as (durations, libraries, tools) and start over - used to send samples from worker processes """
+        with self.lock:
+            samples = (self.durations, self.libraries, self.tools)
+            self.reset()
+        return samples
+
+    def merge(self, samples=None):
+        """ add samples collected in a worker process """
+        durations, libraries, tools = samples
+        with self.lock:
+            for phase in durations:
+                if not phase in self.durations:
+                    self.durations[phase] = array('d')
+                self.durations[phase].extend(durations[phase])
+            for totals, merged in ((self.libraries, libraries), (self.tools, tools)):
+                for key in merged:
+                    totals[key] = totals.get(key, 0.0) + merged[key]
+
+    def get_report(self, top=None):
+        """ return dictionary with count, total, mean, p50, p95 and max seconds by phase and the slowest libraries and tools """
+        phases = {}
+        for phase in sorted(self.durations, key=lambda phase: -sum(self.durations[phase])):
+            values = sorted(self.durations[phase])
+            phases[phase] = {
+                'count' : len(values),
+                'total' : sum(values),
+                'mean' : sum(values) / len(values),
+                'p50' : values[max(0, (len(values) * 50 + 99) // 100 - 1)],
+                'p95' : values[max(0, (len(values) * 95 + 99) // 100 - 1)],
+                'max' : values[-1],
+            }
+        return {
+            'phases' : phases,
+            'slowest_libraries' : [{'library' : key, 'seconds' : seconds} for key, seconds in sorted(self.libraries.items(), key=lambda item: -item[1])[:top]],
+            'slowest_tools' : [{'tool' : key, 'seconds' : seconds} for key, seconds in sorted(self.tools.items(), key=lambda item: -item[1])[:top]],
         }
 
-        # replace \n  with <br> in tool description
-        details['Get_Description_HTML'] = util.add_brs(details['Get_Description'])
-
-        # resolve full path for menu entry
-        details['Full_Menu_Path'] = libraries[lib_title]['Get_Menu']
-        if details['Get_MenuPath'] != "":
-            if  details['Get_MenuPath'][:2] == 'R:':
-                details['Full_Menu_Path'] += "|%s" % details['Get_MenuPath'][2:]
-            elif  details['Get_MenuPath'][:2] == 'A:':
-                details['Full_Menu_Path'] = details['Get_MenuPath'][2:]
-            else:
-                details['Full_Menu_Path'] += "|%s" % details['Get_MenuPath']    # same as R: according to olaf
-
-        # resolve WIKI link if any
-        if ("%s_%s" % (lib_name,i)) in wikilinks:
-            details['WIKI_Link'] = wikilinks["%s_%s" % (lib_name,tool_obj_id.c_str())]
+    def report(self, fpath=None, top=None):
+        """ write JSON report and print a short summary """
+        report = self.get_report(top)
+        with open(fpath, 'w') as f:
+            simplejson.dump(report, f, indent=1)
+
+        print('\nprofile written to {}'.format(fpath))
+        print('{:<18} {:>8} {:>10} {:>10} {:>10}'.format('phase', 'count', 'total s', 'p50 ms', 'p95 ms'))
+        for phase, stats in report['phases'].items():
+            print('{:<18} {:>8} {:>10.2f} {:>10.2f} {:>10.2f}'.format(phase, stats['count'], stats['total'], stats['p50'] * 1000, stats['p95'] * 1000))
+        for kind, key in (('slowest_libraries', 'library'), ('slowest_tools', 'tool')):
+            if report[kind]:
+                print('{}: {}'.format(kind.replace('_', ' '), ', '.join(['%s (%.2f s)' % (entry[key], entry['seconds']) for entry in report[kind][:3]])))
+
+class UsageCache():
+    """ persistent saga_cmd usage cache, one file per SAGA version with entries per library fingerprint and tool ID
+        entries are records of the metadata store in the making, so caches of other store formats are not used
+    """
+    def __init__(self, path=None, version=None, refresh=False):
+        """ load cache file unless a refresh is requested """
+        self.fpath = "%s/saga_cmd_%s.json" % (path, version)
+        self.version = version
+        self.libraries = {}
+        self.hits = 0
+        self.misses = 0
+        if not refresh and os.path.exists(self.fpath):
+            try:
+                with open(self.fpath) as f:
+                    data = simplejson.load(f)
+                if data.get('version') == version and data.get('format') == STORE_FORMAT:
+                    self.libraries = data['libraries']
+            except ValueError:
+                print('WARNING: ignoring unreadable cache file {}'.format(self.fpath))
+
+    def get_tools(self, lib_name=None, fingerprint=None):
+        """ return usage entries of a library by tool ID, entries are dropped if the library file has changed """
+        if lib_name not in self.libraries or self.libraries[lib_name]['fingerprint'] != fingerprint:
+            self.libraries[lib_name] = {'fingerprint' : fingerprint, 'tools' : {}}
+        return self.libraries[lib_name]['tools']
+
+    def set_tools(self, lib_name=None, tools=None):
+        """ replace usage entries of a library with those collected in a worker process """
+        self.libraries[lib_name]['tools'] = tools
+
+    def save(self):
+        """ write cache file, replace the old one only when complete """
+        if not os.path.exists(os.path.dirname(self.fpath)):
+            os.makedirs(os.path.dirname(self.fpath))
+        with open(self.fpath + '.tmp', 'w') as f:
+            simplejson.dump({'version' : self.version, 'format' : STORE_FORMAT, 'libraries' : self.libraries}, f)
+        os.replace(self.fpath + '.tmp', self.fpath)
+
+class BuildManifest():
+    """ build manifest in the output directory, remembers the fingerprints of libraries whose pages are up to date """
+    def __init__(self, path=None, build_key=None):
+        """ load manifest, entries of builds with other templates or options are not reused """
+        self.fpath = "%s/build_manifest.json" % path
+        self.build_key = build_key
+        self.libraries = {}
+        self.stale = {}
+        if os.path.exists(self.fpath):
+            try:
+                with open(self.fpath) as f:
+                    data = simplejson.load(f)
+                if data.get('build_key') == build_key:
+                    self.libraries = data['libraries']
+                else:
+                    self.stale = data['libraries']
+            except ValueError:
+                print('WARNING: ignoring unreadable build manifest {}'.format(self.fpath))
+
+    def get(self, fname=None, fingerprint=None):
+        """ return True if the pages of the given library are up to date """
+        return self.libraries.get(fname) == fingerprint
+
+    def put(self, fname=None, fingerprint=None):
+        """ remember that the pages of the given library have been written """
+        self.libraries[fname] = fingerprint
+        self.stale.pop(fname, None)
+
+    def save(self, libpath=None, path=None):
+        """ write manifest to the directory it was read from or to path, entries of libraries that have vanished from libpath are dropped """
+        if path:
+            self.fpath = "%s/build_manifest.json" % path
+        libraries = {}
+        for entries in (self.stale, self.libraries):
+            for fname in entries:
+                if libpath is None or os.path.exists('%s/%s' % (libpath,fname)):
+                    libraries[fname] = entries[fname]
+        with open(self.fpath + '.tmp', 'w') as f:
+            simplejson.dump({'build_key' : self.build_key, 'libraries' : libraries}, f)
+        os.replace(self.fpath + '.tmp', self.fpath)
+
+class BuildJournal():
+    """ checkpoint journal of a running build, JSON Lines with a header naming the build followed by the tool records and the
+        library record of each finished library, synced to disk per library so --resume can skip them after an interruption
+        the journal is removed once the build is complete
+    """
+    def __init__(self, fpath=None, build_key=None, checkpoint=None):
+        """ remember path and build key, checkpoint is called before a library is journaled, e.g. to wait for its pages """
+        self.fpath = fpath
+        self.build_key = build_key
+        self.checkpoint = checkpoint
+        self.size = 0
+        self.tools = {}
+        self.libraries = {}
+        self.out = None
+
+    def load(self):
+        """ return (fingerprint, tool records, library record) of the libraries journaled by an interrupted build of the same kind
+            by file name, a library cut off by the interruption is dropped
+        """
+        finished = {}
+        if not os.path.exists(self.fpath):
+            return finished
+        tools = []
+        with open(self.fpath, 'rb') as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = simplejson.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                if record['kind'] == 'build':
+                    if record['build_key'] != self.build_key:
+                        return {}
+                    self.size = offset
+                elif record['kind'] == 'tool':
+                    tools.append(record)
+                elif record['kind'] == 'library':
+                    finished[record['fname']] = (record['fingerprint'], tools, record)
+                    tools = []
+                    self.size = offset
+        return finished
+
+    def open(self):
+        """ continue the journal after the libraries returned by load(), start a new one otherwise """
+        if self.size:
+            self.out = open(self.fpath, 'r+b')
+            self.out.truncate(self.size)
+            self.out.seek(self.size)
         else:
-            details['WIKI_Link'] = None
+            if not os.path.exists(os.path.dirname(self.fpath) or '.'):
+                os.makedirs(os.path.dirname(self.fpath))
+            self.out = open(self.fpath, 'wb')
+            self.write([{'kind' : 'build', 'build_key' : self.build_key}])
+
+    def add(self, record=None):
+        """ remember tool record until its library is finished """
+        if not record['fname'] in self.tools:
+            self.tools[record['fname']] = []
+        self.tools[record['fname']].append(record)
+        self.commit(record['fname'])
+
+    def finish(self, lib_record=None):
+        """ remember library record, it is journaled once all of its tool records have been added """
+        self.libraries[lib_record['fname']] = lib_record
+        self.commit(lib_record['fname'])
+
+    def commit(self, fname=None):
+        """ journal a complete library with its tool records, libraries of --tool builds are not journaled """
+        lib_record = self.libraries.get(fname)
+        tools = self.tools.get(fname, [])
+        if lib_record is None or len(tools) < len(lib_record['tools']):
+            return
+        del self.libraries[fname]
+        self.tools.pop(fname, None)
+        if lib_record['is_Complete']:
+            if self.checkpoint:
+                self.checkpoint()
+            self.write(tools + [lib_record])
+
+    def write(self, records=None):
+        """ append records and sync them to disk """
+        for record in records:
+            self.out.write((simplejson.dumps(record, ensure_ascii=False, separators=(',',':')) + '\n').encode('utf8'))
+        self.out.flush()
+        os.fsync(self.out.fileno())
+
+    def remove(self):
+        """ drop the journal of a complete build """
+        self.out.close()
+        os.remove(self.fpath)
+
+class MetadataStore():
+    """ JSON Lines store with all library, tool and parameter metadata plus saga_cmd usage of a build
+        the first line describes the build, followed by one line per tool and one line per library in build order
+    """
+    def __init__(self, fpath=None):
+        """ remember path of store file """
+        self.fpath = fpath
+        self.out = None
+
+    def read(self):
+        """ yield header and records of the store """
+        for offset, record in self.scan():
+            yield record
+
+    def scan(self):
+        """ yield byte offset and record of each line of the store """
+        with open(self.fpath, 'rb') as f:
+            offset = 0
+            for line in f:
+                yield offset, simplejson.loads(line)
+                offset += len(line)
+
+    def read_at(self, offsets=None):
+        """ yield the records at the given byte offsets """
+        with open(self.fpath, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield simplejson.loads(f.readline())
+
+    def get_version(self):
+        """ return SAGA version of the stored build, None if the store has another format """
+        for record in self.read():
+            if record.get('format') != STORE_FORMAT:
+                return None
+            return record['version']
+
+    def get_usage(self):
+        """ return the --usage mode of the stored build """
+        for record in self.read():
+            return record.get('usage')
+
+    def get_libraries(self, version=None, usage=None):
+        """ return (fingerprint, byte offset) of complete library records by file name if the store holds a build of the given version
+            with the given --usage mode, the records themselves are read with read_at() while the old store is still in place
+        """
+        libraries = {}
+        if not os.path.exists(self.fpath):
+            return libraries
+        try:
+            for offset, record in self.scan():
+                if record['kind'] == 'build' and (record['version'] != version or record.get('format') != STORE_FORMAT or record.get('usage') != usage):
+                    break
+                if record['kind'] == 'library' and record['is_Complete']:
+                    libraries[record['fname']] = (record['fingerprint'], offset)
+        except ValueError:
+            print('WARNING: ignoring unreadable metadata store {}'.format(self.fpath))
+            libraries = {}
+        return libraries
+
+    def create(self, version=None, usage=None):
+        """ start writing a new store next to the old one, usage is the --usage mode of the build """
+        if os.path.dirname(self.fpath) and not os.path.exists(os.path.dirname(self.fpath)):
+            os.makedirs(os.path.dirname(self.fpath))
+        self.out = open(self.fpath + '.tmp', 'wb')
+        self.offset = 0
+        self.write({'kind' : 'build', 'version' : version, 'format' : STORE_FORMAT, 'usage' : usage})
+
+    def write(self, record=None):
+        """ append record, returns its byte offset in the new store """
+        line = (simplejson.dumps(record, ensure_ascii=False, separators=(',',':')) + '\n').encode('utf8')
+        self.out.write(line)
+        self.offset += len(line)
+        return self.offset - len(line)
+
+    def close(self, keep_tools=None):
+        """ copy tool records of unchanged libraries from the old store and replace it """
+        if keep_tools and os.path.exists(self.fpath):
+            for record in self.read():
+                if record['kind'] == 'tool' and record['fname'] in keep_tools:
+                    self.write(record)
+        self.out.close()
+        os.replace(self.fpath + '.tmp', self.fpath)
+
+    def get_archive_path(self, version=None):
+        """ return path of the store kept for the given SAGA version, e.g. ./store/tooldoc-9.1.0.jsonl """
+        base, ext = os.path.splitext(self.fpath)
+        return '%s-%s%s' % (base, version, ext)
+
+    def archive(self, version=None):
+        """ keep a hard link or copy of the store for comparisons with later versions """
+        target = self.get_archive_path(version)
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(self.fpath, target)
+        except OSError:
+            shutil.copy2(self.fpath, target)
+
+    def get_tool_digests(self):
+        """ return (title, {field : digest}) of the tool records by <library>_<tool ID>, None if the store has another format
+            fields are tool and library title, saga_cmd usage and the tool details
+        """
+        tools = {}
+        for record in self.read():
+            if record['kind'] == 'build' and record.get('format') != STORE_FORMAT:
+                return None
+            if record['kind'] != 'tool':
+                continue
+            fields = dict(record['details'])
+            for key in ('tool_title', 'lib_title', 'Saga_Cmd'):
+                fields[key] = record[key]
+            tools["%s_%s" % (record['lib_name'], record['tool_id'])] = (record['tool_title'], dict(
+                (key, hashlib.sha1(simplejson.dumps(fields[key], sort_keys=True).encode('utf8')).digest()[:8]) for key in fields
+            ))
+        return tools
+
+class PageTemplate():
+    """ template compiled once into literal text and placeholders
+        substitutes like string.Template.safe_substitute, unknown placeholders are left as they are
+    """
+    def __init__(self, text=None):
+        """ split template text into literals and (name, original text) placeholders """
+        self.literals = []
+        self.names = []
+        literal = []
+        pos = 0
+        for mo in Template.pattern.finditer(text):
+            literal.append(text[pos:mo.start()])
+            pos = mo.end()
+            name = mo.group('named') or mo.group('braced')
+            if name is not None:
+                self.literals.append(''.join(literal))
+                self.names.append((name, mo.group()))
+                literal = []
+            elif mo.group('escaped') is not None:
+                literal.append(Template.delimiter)
+            else:
+                literal.append(mo.group())
+        literal.append(text[pos:])
+        self.literals.append(''.join(literal))
+
+    def render(self, terms=None):
+        """ return text with placeholders replaced by the given terms """
+        parts = [self.literals[0]]
+        for i, (name, original) in enumerate(self.names):
+            parts.append('%s' % (terms[name],) if name in terms else original)
+            parts.append(self.literals[i + 1])
+        return ''.join(parts)
+
+    def render_many(self, contexts=None):
+        """ yield rendered text for each of the given terms """
+        for terms in contexts:
+            yield self.render(terms)
+
+    def stream(self, terms=None):
+        """ yield rendered text piece by piece, terms given as generators are passed on chunk by chunk """
+        yield self.literals[0]
+        for i, (name, original) in enumerate(self.names):
+            if not name in terms:
+                yield original
+            elif isinstance(terms[name], GeneratorType):
+                yield from terms[name]
+            else:
+                yield '%s' % (terms[name],)
+            yield self.literals[i + 1]
+
+class PageTemplates():
+    """ read and compile page templates once """
+    def __init__(self, path=TEMPLATE_PATH):
+        """ start with empty template cache """
+        self.path = path
+        self.templates = {}
+
+    def get(self, name=None):
+        """ return compiled template by name, e.g. tool for ./templates/tool.tpl """
+        if not name in self.templates:
+            self.templates[name] = PageTemplate(util.read_template('%s/%s.tpl' % (self.path, name)))
+        return self.templates[name]
+
+    def render(self, name=None, terms=None):
+        """ render template with a read-only view of the given terms """
+        return self.get(name).render(MappingProxyType(terms))
+
+    def stream(self, name=None, terms=None):
+        """ render template piece by piece with a read-only view of the given terms """
+        return self.get(name).stream(MappingProxyType(terms))
+
+class PageRenderer():
+    """ render tool, library, index, a2z and facet pages from metadata records """
+    def __init__(self, version=None, debugjson=False, templates=None, shared=False):
+        """ remember version, debug switch and compiled templates
+            with shared set, tool and library pages leave the version out of their markup and load it from version.js,
+            so pages of unchanged tools are identical in all version trees and --dedup links them to one object
+        """
+        self.version = version
+        self.debugjson = debugjson
+        self.templates = templates or PageTemplates()
+        self.shared = shared
+
+    def get_terms(self):
+        """ return fresh terms for a page with template terms for version number, version in tool and library pages and
+            empty JSON debug template term
+        """
+        return {
+            'VERSION' : self.version,
+            'Page_Version' : '' if self.shared else ' (v%s)' % self.version,
+            'Version_Script' : '\n<script src="./version.js"></script>' if self.shared else '',
+            'Debug_JSON' : '',
+        }
 
-        # define tool title that will be used in index and a2z pages consisting of tool name and interactive switch
-        tool_title = "%s%s" % (
-            util.cstr_2_str(tool_obj.Get_Name()),
-            ' (interactive)' if details['is_Interactive'] else ''
+    def version_script(self):
+        """ return JavaScript adding the version number to title and header of tool and library pages rendered with shared set """
+        return (
+            '/* version of this documentation tree, written by parse_modules.py */\n'
+            'document.title += " (v%s)";\n'
+            'window.addEventListener("load", function () {\n'
+            '    var header;\n'
+            '    header = document.querySelector("header h1");\n'
+            '    if (header) {\n'
+            '        header.textContent += " (v%s)";\n'
+            '    }\n'
+            '}, false);\n' % (self.version, self.version)
         )
 
-        # remember links to tool docs by title
-        libraries[lib_title]['doc_Links'][tool_title] = '%s_%s.html' % (lib_name, tool_obj_id.c_str())
+    def tool_pages(self, records=None):
+        """ yield file name and HTML of tool pages for the given tool records """
+        for record in records:
+            yield self.tool_page(record)
 
-        # fill a2z index, use list approach to ensure that duplicate tool names in different libraries don't get lost
-        if not tool_title in a2z:
-            a2z[tool_title] = []
-        a2z[tool_title].append('<tr><td><a href="%s">%s</a></td><td class="menuPath">%s</td></tr>' % (
-            '%s_%s.html' % (lib_name, tool_obj_id.c_str()),
-            tool_title,
-            details['Full_Menu_Path']
-        ))
+    def tool_page(self, record=None):
+        """ return file name and HTML of a tool page """
+        start = time.perf_counter()
+        details = record['details']
 
-        # unload tool
-        tool_obj.Destroy()
+        TPL_TERMS = self.get_terms()
 
         # create tool page
-        TPL_TERMS['Get_Name'] = tool_title
+        TPL_TERMS['Get_Name'] = record['tool_title']
         TPL_TERMS['Get_Author'] = details['Get_Author']
         TPL_TERMS['Get_ID'] = details['Get_ID']
         TPL_TERMS['Get_Description'] = details['Get_Description']
@@ -313,8 +802,8 @@ for fname in os.listdir(args.libpath):
         TPL_TERMS['Get_References'] = details['Get_References']
 
         TPL_TERMS['Full_Menu_Path'] = details['Full_Menu_Path']
-        if args.debugjson:
-            TPL_TERMS['Debug_JSON'] = util.as_json(details)
+        if self.debugjson:
+            TPL_TERMS['Debug_JSON'] = util.debug_link("%s_%s" % (record['lib_name'],record['tool_id']))
 
         # add link to WIKI if any
         if details['WIKI_Link']:
@@ -331,10 +820,10 @@ for fname in os.listdir(args.libpath):
             if section in details['Get_Parameters']:
                 rows = []
                 section_column = None
-                for param in details['Get_Parameters'][section]:
+                for param in map(Parameter._make, details['Get_Parameters'][section]):
                     # mark optional entries
                     is_optional = ""
-                    if param['is_Optional']:
+                    if param.is_Optional:
                         is_optional = " (*)"
                         has_optional = True
 
@@ -349,12 +838,12 @@ for fname in os.listdir(args.libpath):
 
                     rows.append('<tr>%s<td>%s%s</td><td>%s</td><td><code>%s</code></td><td>%s</td><td>%s</td></tr>\n' % (
                         section_column,
-                        param['Get_Name'],
+                        param.Get_Name,
                         is_optional,
-                        (param['Get_Description_2']) or '-',
-                        (param['Get_Identifier']) or '-',
-                        (param['Get_Description']) or '-',
-                        (util.add_brs(param['Get_Description_8'])) or '-'
+                        (param.Get_Description_2) or '-',
+                        (param.Get_Identifier) or '-',
+                        (param.Get_Description) or '-',
+                        (util.add_brs(param.Get_Description_8)) or '-'
                     ))
                 TPL_TERMS['PARAMS_%s' % section] = '\n'.join(rows)
             else:
@@ -365,159 +854,1822 @@ for fname in os.listdir(args.libpath):
             '<tr><td colspan="6">(*) optional</td></tr>' if has_optional else ''
         )
 
-        # list tools with clashing is_Interactive and needs_GUI switches
-        if not details['is_Interactive'] == details['needs_GUI']:
-            debug_log.write("DEBUG: %s has is_Interactive=%s and needs_GUI=%s\n" % (
-                tool_title,details['is_Interactive'],details['needs_GUI']
-            ))
-            has_debug = True
-
-        # resolve saga_cmd usage for tools that do not need the GUI or are non-interactive
-        if not details['is_Interactive']:
-            proc = subprocess.Popen(['saga_cmd', lib_name, tool_obj_id.c_str()], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-            out, err = proc.communicate()
-            if err:
-                if details['needs_GUI']:
-                    # set GUI hint as cmd usage
-                    TPL_TERMS['Saga_Cmd'] = re.sub('Error: ','',err)
-                else:
-                    print('ERROR: saga_cmd {} {} '.format(lib_name, tool_obj_id.c_str()))
-                    error_log.write("ERROR: saga_cmd %s %s\n" % (lib_name,tool_obj_id.c_str()))
-                    error_log.write("       %s\n" % err)
-                    TPL_TERMS['Saga_Cmd'] = "ERROR: %s" % err
-            if out and not details['needs_GUI']:
-                # extract tool usage
-                usage = []
-                collect_usage = False
-                for line in out.split('\n'):
-                    if line[:5] == "Usage":
-                        collect_usage = True
-                    if collect_usage:
-                        # fix missing lib_name and lib number for saga_cmd help prior to 2.1.3
-                        if not re.search('saga_cmd %s %s' % (lib_name,tool_obj_id.c_str()), line):
-                            line = re.sub("saga_cmd", "saga_cmd %s %s" % (lib_name,tool_obj_id.c_str()), line)
-
-                        # escape markup
-                        line = re.sub("<","&lt;", line)
-
-                        # mark command
-                        line = re.sub('saga_cmd %s %s' % (lib_name,tool_obj_id.c_str()),'<strong>saga_cmd %s %s</strong>' % (lib_name,tool_obj_id.c_str()), line)
-
-                        # append line
-                        usage.append(line)
-
-                if not usage:
-                    error_log.write("WARNING: saga_cmd %s %s has no, or unknown usage string:\n%s\n\n" % (lib_name,tool_obj_id.c_str(),usage))
-                    print('NOTICE: saga_cmd {} {} has no, or unknown usage string. Please check.'.format(lib_name, tool_obj_id.c_str()))
-                TPL_TERMS['Saga_Cmd'] = "%s" % (
-                    '\n'.join(usage)
-                )
-        else:
-            TPL_TERMS['Saga_Cmd'] = 'this interactive tool can not be executed.'
+        # add saga_cmd usage
+        TPL_TERMS['Saga_Cmd'] = record['Saga_Cmd']
 
         # add backlink
-        TPL_TERMS['BACK_Link'] = "./%s.html" % lib_name
-        TPL_TERMS['BACK_Text'] = lib_title
+        TPL_TERMS['BACK_Link'] = "./%s.html" % record['lib_name']
+        TPL_TERMS['BACK_Text'] = record['lib_title']
 
         # resolve tool template
-        s = Template(util.read_template('./templates/tool.tpl'))
-        o = open("%s/%s_%s.html" % (HTML_PATH,lib_name,tool_obj_id.c_str()), "wb")
-        o.write(s.safe_substitute(TPL_TERMS).encode('utf8'))
-        o.close()
-        print('created {}/{}_{}.html'.format(HTML_PATH, lib_name, tool_obj_id.c_str()))
-
-    # unload library
-    saga_api.SG_Get_Tool_Library_Manager().Del_Library(0)
-
-    # create index page for tools in library
-    TPL_TERMS['Tool_Links'] = ''
-    TPL_TERMS['Get_Name'] = libraries[lib_title]['Get_Name']
-    TPL_TERMS['Get_Author'] = libraries[lib_title]['Get_Author']
-    TPL_TERMS['Get_Version'] = libraries[lib_title]['Get_Version']
-    TPL_TERMS['Get_File_Name'] = libraries[lib_title]['Get_File_Name']
-    TPL_TERMS['Get_Menu'] = libraries[lib_title]['Get_Menu']
-    TPL_TERMS['Get_Description'] = libraries[lib_title]['Get_Description']
-    if args.debugjson:
-        TPL_TERMS['Debug_JSON'] = util.as_json(libraries[lib_title])
-
-    # add link to WIKI if any
-    if libraries[lib_title]['WIKI_Link']:
-        TPL_TERMS['WIKI_Link'] = '<li>WIKI: <a href="%s">%s</a></li>' % (
-            libraries[lib_title]['WIKI_Link'],
-            libraries[lib_title]['WIKI_Link']
+        html = self.templates.render('tool', TPL_TERMS)
+        profiler.stop('render_tool', start, tool="%s_%s" % (record['lib_name'],record['tool_id']))
+        return "%s_%s.html" % (record['lib_name'],record['tool_id']), html
+
+    def library_page(self, record=None):
+        """ return file name and HTML of a library page """
+        start = time.perf_counter()
+        library = record['library']
+
+        TPL_TERMS = self.get_terms()
+
+        # create index page for tools in library
+        TPL_TERMS['Tool_Links'] = ''
+        TPL_TERMS['Get_Name'] = library['Get_Name']
+        TPL_TERMS['Get_Author'] = library['Get_Author']
+        TPL_TERMS['Get_Version'] = library['Get_Version']
+        TPL_TERMS['Get_File_Name'] = library['Get_File_Name']
+        TPL_TERMS['Get_Menu'] = library['Get_Menu']
+        TPL_TERMS['Get_Description'] = library['Get_Description']
+        if self.debugjson:
+            TPL_TERMS['Debug_JSON'] = util.debug_link(record['lib_name'])
+
+        # add link to WIKI if any
+        if library['WIKI_Link']:
+            TPL_TERMS['WIKI_Link'] = '<li>WIKI: <a href="%s">%s</a></li>' % (
+                library['WIKI_Link'],
+                library['WIKI_Link']
+            )
+        else:
+            TPL_TERMS['WIKI_Link'] = ''
+
+        # set links to tool pages
+        order = list(library['doc_Links'].keys())
+        order.sort()
+        for tool_name in order:
+            TPL_TERMS['Tool_Links'] += "<li><a href='%s'>%s</a></li>" % (
+                library['doc_Links'][tool_name],
+                tool_name
+            )
+
+        # resolve library template
+        html = self.templates.render('library', TPL_TERMS)
+        profiler.stop('render_library', start)
+        return "%s.html" % record['lib_name'], html
+
+    def index_page(self, index=None, store=None):
+        """ yield HTML of the index page piece by piece """
+        TPL_TERMS = self.get_terms()
+
+        # create index page for libraries
+        if self.debugjson:
+            TPL_TERMS['Debug_JSON'] = util.debug_link('index')
+
+        # set links to library pages
+        TPL_TERMS['Library_Links'] = (
+            "<tr><td style='white-space: nowrap'><a href='%s'>%s</a></td><td>%s</td><td class='center'>%s</td></tr>" % (
+                entry.link,
+                lib_title,
+                entry.description,
+                entry.tool_count
+            ) for lib_title, entry in index.get_libraries()
         )
-    else:
-        TPL_TERMS['WIKI_Link'] = ''
 
-    # set links to tool pages
-    order = list(libraries[lib_title]['doc_Links'].keys())
-    order.sort()
-    for tool_name in order:
-        TPL_TERMS['Tool_Links'] += "<li><a href='%s'>%s</a></li>" % (
-            libraries[lib_title]['doc_Links'][tool_name],
-            tool_name
+        # resolve startpage template
+        return self.templates.stream('index', TPL_TERMS)
+
+    def a2z_page(self, index=None, store=None):
+        """ yield HTML of the a2z index page piece by piece, the debug JSON of the libraries is shared with the index page """
+        TPL_TERMS = self.get_terms()
+        if self.debugjson:
+            TPL_TERMS['Debug_JSON'] = util.debug_link('index')
+
+        # create a2z index page, tools with the same title are listed in build order
+        tools = index.get_tools()
+
+        # sort ranks of the columns for lib/tablesort.js, rows are in tool column order, the menu column is ordered like the
+        # compound keys tablesort.js used to build from the cells: menu path, tool title, row
+        menu_ranks = [0] * len(tools)
+        for rank, row in enumerate(sorted(range(len(tools)), key=lambda row: (tools[row].menu_path, tools[row].title, row))):
+            menu_ranks[row] = rank
+
+        TPL_TERMS['A2Z_Links'] = (
+            '<tr><td data-rank="%d"><a href="%s">%s</a></td><td class="menuPath" data-rank="%d">%s</td></tr>\n' % (
+                row,
+                entry.link,
+                entry.title,
+                menu_ranks[row],
+                entry.menu_path
+            ) for row, entry in enumerate(tools)
         )
 
-    # resolve library template
-    s = Template(util.read_template('./templates/library.tpl'))
-    o = open("%s/%s.html" % (HTML_PATH,lib_name), "wb")
-    o.write(s.safe_substitute(TPL_TERMS).encode('utf8'))
-    o.close()
-    print('created {}/{}.html'.format(HTML_PATH, lib_name))
-
-# create index page for libraries
-TPL_TERMS['Library_Links'] = ''
-if args.debugjson:
-    TPL_TERMS['Debug_JSON'] = util.as_json(libraries)
-
-# set links to library pages
-order = list(libraries.keys())
-order.sort()
-for lib_name in order:
-    TPL_TERMS['Library_Links'] += "<tr><td style='white-space: nowrap'><a href='%s'>%s</a></td><td>%s</td><td class='center'>%s</td></tr>" % (
-        "%s.html" % util.lib_name_from_so(libraries[lib_name]['Get_File_Name']),
-        lib_name,
-        libraries[lib_name]['Get_Description'],
-        len(libraries[lib_name]['doc_Links'].keys())
+        # resolve a2z template
+        return self.templates.stream('a2z', TPL_TERMS)
+
+    def types_page(self, facets=None):
+        """ yield HTML of the data types page piece by piece, one section per data type with the tools reading and writing it """
+        TPL_TERMS = self.get_terms()
+        TPL_TERMS['TITLE'] = 'Data Types'
+        types = facets.get_types()
+        TPL_TERMS['Facet_Links'] = ' | '.join([
+            "<a href='#%s'>%s</a>" % (identifier, facet['name']) for identifier, facet in types
+        ])
+
+        def sections():
+            for identifier, facet in types:
+                yield "<h2 id='%s'>%s</h2>\n<table>\n<tr><th>Input of %d tools</th><th>Output of %d tools</th></tr>\n<tr>" % (
+                    identifier, facet['name'], len(facet['input']), len(facet['output'])
+                )
+                for direction in ('input', 'output'):
+                    yield "<td><ul>%s</ul></td>" % ''.join([
+                        "<li><a href='%s'>%s</a></li>" % (facets.tools[tool][1], facets.tools[tool][0]) for tool in facet[direction]
+                    ])
+                yield "</tr>\n</table>\n"
+        TPL_TERMS['Facet_Content'] = sections()
+
+        # resolve facet template
+        return self.templates.stream('facet', TPL_TERMS)
+
+    def menus_page(self, facets=None):
+        """ yield HTML of the menus page piece by piece, one section per menu level with the tools right in it """
+        TPL_TERMS = self.get_terms()
+        TPL_TERMS['TITLE'] = 'Menus'
+        menus = facets.get_menus()
+        TPL_TERMS['Facet_Links'] = ' | '.join([
+            "<a href='#menu-%d'>%s</a> (%d)" % (n, path, len(tools)) for n, (path, tools) in enumerate(menus) if not '|' in path
+        ])
+
+        def sections():
+            for n, (path, tools) in enumerate(menus):
+                segments = path.split('|')
+                yield "<h%d id='menu-%d' style='margin-left: %dem'>%s <span class='menuPath'>%d tools</span></h%d>\n" % (
+                    min(len(segments) + 1, 6), n, 2 * (len(segments) - 1), segments[-1], len(tools), min(len(segments) + 1, 6)
+                )
+                here = [tool for tool in tools if facets.tools[tool][2] == path]
+                if here:
+                    yield "<ul style='margin-left: %dem'>%s</ul>\n" % (2 * (len(segments) - 1), ''.join([
+                        "<li><a href='%s'>%s</a></li>" % (facets.tools[tool][1], facets.tools[tool][0]) for tool in here
+                    ]))
+        TPL_TERMS['Facet_Content'] = sections()
+
+        # resolve facet template
+        return self.templates.stream('facet', TPL_TERMS)
+
+class LibraryEntry():
+    """ compact index page entry of a library, its details stay in the metadata store """
+    __slots__ = ('link', 'description', 'tool_count', 'offset')
+
+    def __init__(self, link=None, description=None, tool_count=None, offset=None):
+        """ remember link, description, number of tools and byte offset of the library record in the store """
+        self.link = link
+        self.description = description
+        self.tool_count = tool_count
+        self.offset = offset
+
+class ToolEntry():
+    """ compact a2z page entry of a tool """
+    __slots__ = ('title', 'link', 'menu_path')
+
+    def __init__(self, title=None, link=None, menu_path=None):
+        """ remember title, link and menu path, menu paths are shared by many tools """
+        self.title = title
+        self.link = link
+        self.menu_path = sys.intern(menu_path)
+
+class SearchIndex():
+    """ prebuilt client-side search index over tools and their parameters, queried by lib/search.js
+        search/tools.json lists the tools as [title, link, library, menu path] and the names of all shards,
+        search/<prefix>.json maps the terms starting with a two character prefix to flat [tool number, weight, ...] lists
+    """
+    # weight of a term by the field it was found in, a term counts with its highest weight per tool
+    WEIGHTS = {
+        'title' : 8,
+        'identifier' : 4,
+        'parameter' : 3,
+        'library' : 2,
+        'menu' : 2,
+        'description' : 1,
+    }
+
+    def __init__(self):
+        """ start with empty index """
+        self.tools = []
+        self.terms = {}
+
+    def add(self, record=None):
+        """ add terms of a tool record """
+        details = record['details']
+        tool = len(self.tools)
+        self.tools.append([
+            record['tool_title'],
+            "%s_%s.html" % (record['lib_name'], record['tool_id']),
+            record['lib_title'],
+            details['Full_Menu_Path'],
+        ])
+        self.add_terms(tool, record['tool_title'], 'title')
+        self.add_terms(tool, record['lib_title'], 'library')
+        self.add_terms(tool, details['Full_Menu_Path'], 'menu')
+        self.add_terms(tool, details['Get_Description'], 'description')
+        for section in details['Get_Parameters']:
+            for param in map(Parameter._make, details['Get_Parameters'][section]):
+                self.add_terms(tool, param.Get_Identifier, 'identifier')
+                self.add_terms(tool, param.Get_Name, 'parameter')
+                self.add_terms(tool, param.Get_Description, 'description')
+
+    def add_terms(self, tool=None, text=None, field=None):
+        """ index words of text without markup, words with underscores are indexed as a whole and by their parts """
+        if not text:
+            return
+        weight = self.WEIGHTS[field]
+        for word in re.findall(r'\w+', re.sub(r'<[^>]+>', ' ', text).lower()):
+            for term in [word] + (word.split('_') if '_' in word else []):
+                if len(term) < 2:
+                    continue
+                postings = self.terms.get(term)
+                if postings is None:
+                    postings = self.terms[term] = {}
+                if postings.get(tool, 0) < weight:
+                    postings[tool] = weight
+
+    def get_shard_name(self, prefix=None):
+        """ return file name safe shard name of a term prefix, same as shardName() in lib/search.js """
+        return ''.join([c if 'a' <= c <= 'z' or '0' <= c <= '9' else '_%x' % ord(c) for c in prefix])
+
+    def get_shards(self):
+        """ sort tools by title and link, so the index does not depend on build order
+            return {shard name : {term : [tool number, weight, ...]}}
+        """
+        order = sorted(range(len(self.tools)), key=lambda tool: self.tools[tool][:2])
+        number = dict((tool, n) for n, tool in enumerate(order))
+        self.tools = [self.tools[tool] for tool in order]
+
+        shards = {}
+        for term in sorted(self.terms):
+            shard = self.get_shard_name(term[:2])
+            if not shard in shards:
+                shards[shard] = {}
+            postings = shards[shard][term] = []
+            for tool, weight in sorted((number[tool], weight) for tool, weight in self.terms[term].items()):
+                postings.extend((tool, weight))
+        self.terms = {}
+        return shards
+
+class FacetIndex():
+    """ inverted indexes from data types to the tools reading or writing them and from menu paths to the tools below them
+        tools are numbered in title order, as on the a2z page
+    """
+    def __init__(self):
+        """ start with empty indexes """
+        self.tools = []
+        self.types = {}
+        self.menus = {}
+
+    def add(self, record=None):
+        """ add tool record to the data types of its input and output parameters and to every level of its menu path """
+        details = record['details']
+        tool = len(self.tools)
+        self.tools.append([record['tool_title'], "%s_%s.html" % (record['lib_name'], record['tool_id']), details['Full_Menu_Path']])
+        for section, direction in (('Input', 'input'), ('Output', 'output')):
+            for param in map(Parameter._make, details['Get_Parameters'].get(section, [])):
+                if not param.Get_Type_Identifier in self.types:
+                    self.types[param.Get_Type_Identifier] = {'name' : param.Get_Type_Name, 'input' : [], 'output' : []}
+                tools = self.types[param.Get_Type_Identifier][direction]
+                if not tools or tools[-1] != tool:
+                    tools.append(tool)
+        segments = details['Full_Menu_Path'].split('|')
+        for n in range(1, len(segments) + 1):
+            path = '|'.join(segments[:n])
+            if not path in self.menus:
+                self.menus[path] = []
+            self.menus[path].append(tool)
+
+    def sort(self):
+        """ renumber tools by title and link, so the indexes do not depend on build order """
+        order = sorted(range(len(self.tools)), key=lambda tool: self.tools[tool])
+        number = dict((tool, n) for n, tool in enumerate(order))
+        self.tools = [self.tools[tool] for tool in order]
+        for facet in self.types.values():
+            facet['input'] = sorted(number[tool] for tool in facet['input'])
+            facet['output'] = sorted(number[tool] for tool in facet['output'])
+        for path in self.menus:
+            self.menus[path] = sorted(number[tool] for tool in self.menus[path])
+
+    def get_types(self):
+        """ return (identifier, facet) of data types sorted by name """
+        return sorted(self.types.items(), key=lambda item: (item[1]['name'], item[0]))
+
+    def get_menus(self):
+        """ return (path, tool numbers) of all menu levels sorted by path """
+        return sorted(self.menus.items(), key=lambda item: item[0].split('|'))
+
+    def as_json(self):
+        """ return compact JSON of tools as [title, link, menu path] and of both indexes as lists of tool numbers """
+        return simplejson.dumps({
+            'tools' : self.tools,
+            'types' : dict(self.get_types()),
+            'menus' : dict(self.get_menus()),
+        }, ensure_ascii=False, separators=(',',':'))
+
+class PageIndex():
+    """ compact entries of all libraries and tools for the index and a2z pages, the only state kept for the whole build """
+    def __init__(self):
+        """ start with empty index """
+        self.libraries = {}
+        self.tools = []
+
+    def add(self, lib_record=None, offset=None):
+        """ add entries of a library record stored at the given byte offset, a later library with the same title replaces an earlier one """
+        library = lib_record['library']
+        self.libraries[lib_record['lib_title']] = LibraryEntry(
+            "%s.html" % util.lib_name_from_so(library['Get_File_Name']),
+            library['Get_Description'],
+            len(library['doc_Links']),
+            offset
+        )
+        for tool_title, link, menu_path in lib_record['tools']:
+            self.tools.append(ToolEntry(tool_title, link, menu_path))
+
+    def get_libraries(self):
+        """ return (title, entry) of libraries sorted by title """
+        return sorted(self.libraries.items(), key=lambda item: item[0])
+
+    def get_tools(self):
+        """ return tool entries sorted by title, the sort is stable so equal titles keep build order """
+        self.tools.sort(key=lambda entry: entry.title)
+        return self.tools
+
+    def get_details(self, store=None):
+        """ yield (title, library details) sorted by title, read back from the metadata store """
+        order = self.get_libraries()
+        records = store.read_at([entry.offset for lib_title, entry in order])
+        for (lib_title, entry), record in zip(order, records):
+            yield lib_title, record['library']
+
+class StagedWriter():
+    """ write files into a staging copy of an output directory and swap it in once the build is complete
+        the staging copy starts as hard links to the current files and files are only replaced if their content changed,
+        so unchanged files keep inode and modification time and a failed run leaves the current tree untouched
+    """
+    def __init__(self, path=None, jobs=None, objects=None, resume=False):
+        """ clean up after interrupted runs, clone the current tree and start the writer pool
+            with objects set, written files are hard links into that content-addressed object store shared by all version trees
+            with resume set, the staging directory of an interrupted run is kept with the pages written so far
+        """
+        self.path = path
+        self.objects = objects
+        self.staging = path + '.staging'
+        self.previous = path + '.previous'
+        self.written = 0
+        self.skipped = 0
+        self.errors = []
+        self.created = deque()
+        self.lock = threading.Lock()
+
+        self.builds = os.path.join(os.path.dirname(path), '.builds')
+        self.link = path + '.link'
+
+        # a run that died between the renames of commit() left the last complete tree in .previous
+        if os.path.isdir(self.previous):
+            if os.path.exists(self.path):
+                shutil.rmtree(self.previous)
+            else:
+                os.rename(self.previous, self.path)
+        # build directories the symlink doesn't point to are left over from interrupted commits
+        if os.path.lexists(self.link):
+            os.remove(self.link)
+        if os.path.isdir(self.builds):
+            current = os.path.realpath(self.path)
+            for dname in os.listdir(self.builds):
+                build = os.path.join(self.builds, dname)
+                if dname.rpartition('-')[0] == os.path.basename(path) and os.path.realpath(build) != current:
+                    shutil.rmtree(build, True)
+        if resume and os.path.isdir(self.staging):
+            print('resuming in {} ...'.format(self.staging))
+        else:
+            shutil.rmtree(self.staging, True)
+            self.clone()
+
+        # pages are written in the background, a limited number waits for a writer to keep memory bounded
+        self.pool = ThreadPoolExecutor(max_workers=max(1, jobs))
+        self.slot_count = 4 * max(1, jobs)
+        self.slots = threading.BoundedSemaphore(self.slot_count)
+
+    def clone(self):
+        """ fill the staging directory with hard links to the current tree, copies where links are not supported """
+        os.mkdir(self.staging)
+        if not os.path.isdir(self.path):
+            return
+        for root, dirs, files in os.walk(self.path):
+            target = os.path.join(self.staging, os.path.relpath(root, self.path))
+            for dname in dirs:
+                os.mkdir(os.path.join(target, dname))
+            for fname in files:
+                fpath = os.path.join(root, fname)
+                if self.objects and os.stat(fpath).st_nlink == 1:
+                    # files written before the object store was used are moved into it once
+                    shutil.copy2(fpath, os.path.join(target, fname) + '.tmp')
+                    install_file(os.path.join(target, fname) + '.tmp', os.path.join(target, fname), self.objects)
+                    continue
+                try:
+                    os.link(fpath, os.path.join(target, fname))
+                except OSError:
+                    shutil.copy2(fpath, os.path.join(target, fname))
+
+    def write(self, fname=None, data=None):
+        """ queue bytes to be written to fname relative to the output directory """
+        self.report()
+        self.make_dirs(fname)
+        self.slots.acquire()
+        future = self.pool.submit(self.write_file, fname, data)
+        future.add_done_callback(self.finish_write)
+
+    def wait(self):
+        """ block until all queued files are written """
+        for slot in range(self.slot_count):
+            self.slots.acquire()
+        for slot in range(self.slot_count):
+            self.slots.release()
+
+    def make_dirs(self, fname=None):
+        """ create the parent directories of fname relative to the output directory """
+        if os.sep in fname or '/' in fname:
+            os.makedirs(os.path.dirname(os.path.join(self.staging, fname)), exist_ok=True)
+
+    def finish_write(self, future=None):
+        """ free the slot of a written file, remember errors for commit() """
+        self.slots.release()
+        if future.exception():
+            self.errors.append(future.exception())
+
+    def write_file(self, fname=None, data=None):
+        """ replace the staged file through a temporary file unless it has the same content - runs in writer threads """
+        start = time.perf_counter()
+        target = os.path.join(self.staging, fname)
+        if os.path.exists(target) and os.path.getsize(target) == len(data):
+            with open(target, 'rb') as f:
+                if f.read() == data:
+                    self.count(fname, False)
+                    return
+        with open(target + '.tmp', 'wb') as f:
+            f.write(data)
+        install_file(target + '.tmp', target, self.objects)
+        self.count(fname, True)
+        profiler.stop('write_page', start)
+
+    def write_stream(self, fname=None, chunks=None):
+        """ write str pieces to fname relative to the output directory, the temporary file is dropped if the content is unchanged """
+        start = time.perf_counter()
+        self.make_dirs(fname)
+        target = os.path.join(self.staging, fname)
+        with open(target + '.tmp', 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk.encode('utf8'))
+        if os.path.exists(target) and filecmp.cmp(target + '.tmp', target, shallow=False):
+            os.remove(target + '.tmp')
+            self.count(fname, False)
+            return
+        install_file(target + '.tmp', target, self.objects)
+        self.count(fname, True)
+        profiler.stop('write_page', start)
+
+    def sync(self, src=None, subdir=None):
+        """ mirror directory src to subdir of the output directory, copy changed files only and drop vanished ones, .svn is left out """
+        target = os.path.join(self.staging, subdir)
+        for root, dirs, files in os.walk(src):
+            dirs[:] = [dname for dname in dirs if dname != '.svn']
+            target_dir = os.path.normpath(os.path.join(target, os.path.relpath(root, src)))
+            if not os.path.isdir(target_dir):
+                os.makedirs(target_dir)
+            for fname in files:
+                source = os.path.join(root, fname)
+                staged = os.path.join(target_dir, fname)
+                if os.path.exists(staged) and filecmp.cmp(source, staged, shallow=False):
+                    self.count(None, False)
+                    continue
+                shutil.copyfile(source, staged + '.tmp')
+                shutil.copymode(source, staged + '.tmp')
+                install_file(staged + '.tmp', staged, self.objects)
+                self.count(None, True)
+        for root, dirs, files in os.walk(target, topdown=False):
+            origin = os.path.normpath(os.path.join(src, os.path.relpath(root, target)))
+            for fname in files:
+                source = os.path.join(origin, fname)
+                if os.path.splitext(fname)[1] in get_compress_suffixes():
+                    source = os.path.splitext(source)[0]
+                if not os.path.isfile(source) or '.svn' in os.path.relpath(root, target).split(os.sep):
+                    os.remove(os.path.join(root, fname))
+            for dname in dirs:
+                if not os.path.isdir(os.path.join(origin, dname)) or dname == '.svn':
+                    shutil.rmtree(os.path.join(root, dname), True)
+
+    def prune(self, subdir=None, keep=None):
+        """ remove files of subdir that are not in keep along with their compressed siblings and subdir itself once it is empty,
+            temporary files of pending writes are left alone
+        """
+        path = os.path.join(self.staging, subdir)
+        if not os.path.isdir(path):
+            return
+        suffixes = get_compress_suffixes()
+        for fname in os.listdir(path):
+            name, ext = os.path.splitext(fname)
+            if not (name if ext in suffixes else fname) in keep and ext != '.tmp':
+                os.remove(os.path.join(path, fname))
+        if not os.listdir(path):
+            os.rmdir(path)
+
+    def count(self, fname=None, written=False):
+        """ count written and skipped files, report written pages """
+        with self.lock:
+            if written:
+                self.written += 1
+            else:
+                self.skipped += 1
+        if written and fname:
+            self.created.append(fname)
+
+    def report(self):
+        """ print written pages in the main thread, so messages of writer threads do not interleave with other output """
+        while self.created:
+            print('created {}/{}'.format(self.path, self.created.popleft()))
+
+    def compress(self, jobs=None):
+        """ write precompressed siblings of HTML, CSS, JS and JSON files in a process pool, prints the total size reduction by codec
+            siblings are kept if their file has the content they were compressed from, going by the SHA1 digests in
+            compress_manifest.json, modification times are not used since objects of --dedup are shared by all version trees
+        """
+        self.pool.shutdown(wait=True)
+        self.report()
+        suffixes = get_compress_suffixes()
+        manifest = os.path.join(self.staging, 'compress_manifest.json')
+        digests = {}
+        if os.path.exists(manifest):
+            try:
+                with open(manifest) as f:
+                    data = simplejson.load(f)
+                if data.get('suffixes') == suffixes:
+                    digests = data['files']
+            except ValueError:
+                print('WARNING: ignoring unreadable compress manifest {}'.format(manifest))
+        fpaths = []
+        for root, dirs, files in os.walk(self.staging):
+            for fname in files:
+                fpath = os.path.join(root, fname)
+                if os.path.splitext(fname)[1] in COMPRESS_EXTENSIONS and not fname in ('build_manifest.json', 'compress_manifest.json'):
+                    fpaths.append(fpath)
+                elif os.path.splitext(fname)[1] in suffixes and not os.path.exists(os.path.splitext(fpath)[0]):
+                    # drop siblings of files that are gone
+                    os.remove(fpath)
+
+        print('\ncompressing {} files with {} ...'.format(len(fpaths), ', '.join(suffixes)))
+        total = 0
+        compressed = dict((suffix, 0) for suffix in suffixes)
+        written = 0
+        names = [os.path.relpath(fpath, self.staging).replace(os.sep, '/') for fpath in fpaths]
+        files = {}
+        with ProcessPoolExecutor(max_workers=max(1, jobs), mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = pool.map(compress_file, fpaths, [suffixes] * len(fpaths), [self.objects] * len(fpaths), [digests.get(name) for name in names], chunksize=32)
+            for name, (size, sizes, is_written, digest) in zip(names, results):
+                files[name] = digest
+                total += size
+                for suffix, sibling_size in sizes:
+                    compressed[suffix] += sibling_size
+                written += is_written
+        with open(manifest + '.tmp', 'w') as f:
+            simplejson.dump({'suffixes' : suffixes, 'files' : dict(sorted(files.items()))}, f, separators=(',',':'))
+        os.replace(manifest + '.tmp', manifest)
+        print('compressed {} files, {} up to date'.format(written, len(fpaths) - written))
+        for suffix in suffixes:
+            print('{}: {:.1f} MB -> {:.1f} MB ({:.0f}% smaller)'.format(
+                suffix, total / 1048576.0, compressed[suffix] / 1048576.0, 100.0 - 100.0 * compressed[suffix] / max(1, total)
+            ))
+
+    def commit(self):
+        """ wait for pending writes and publish the staging directory
+            the tree is moved to a build directory and the symlink path is replaced in one os.replace(), so requests
+            see either the old or the new tree, never a missing one
+        """
+        self.pool.shutdown(wait=True)
+        self.report()
+        if self.errors:
+            raise self.errors[0]
+        current = os.path.realpath(self.path) if os.path.islink(self.path) else None
+        build = os.path.join(self.builds, '%s-%d' % (os.path.basename(self.path), time.time_ns()))
+        os.makedirs(self.builds, exist_ok=True)
+        os.rename(self.staging, build)
+        try:
+            os.symlink(os.path.relpath(build, os.path.dirname(self.path)), self.link, target_is_directory=True)
+        except (OSError, NotImplementedError):
+            # no symlinks on this file system, swap the directories with two renames
+            os.rename(build, self.staging)
+            if os.path.exists(self.path):
+                os.rename(self.path, self.previous)
+            os.rename(self.staging, self.path)
+        else:
+            if os.path.isdir(self.path) and not current:
+                # trees of older runs are directories, os.replace() can only swap a symlink for a file or symlink
+                os.rename(self.path, self.previous)
+            os.replace(self.link, self.path)
+            if current:
+                shutil.rmtree(current, True)
+        shutil.rmtree(self.previous, True)
+
+        # drop objects that are no longer linked from any version tree
+        if self.objects:
+            for root, dirs, files in os.walk(self.objects):
+                for fname in files:
+                    if os.stat(os.path.join(root, fname)).st_nlink == 1:
+                        os.remove(os.path.join(root, fname))
+
+class BuildOutput():
+    """ write pages to the output directory, tool records to the metadata store and messages to error and debug log """
+    def __init__(self, path=None, renderer=None, store=None, logs=True, jobs=1, compress=False, objects=None, resume=False):
+        """ open error and debug log, pages are staged and written by jobs background writers
+            with compress set, precompressed siblings are written by jobs processes before the pages are swapped in
+            with resume set, pages and log messages of an interrupted run are kept
+        """
+        self.path = path
+        self.jobs = jobs
+        self.compress = compress
+        self.writer = StagedWriter(path, jobs, objects, resume) if path else None
+        self.renderer = renderer
+        self.store = store
+        self.journal = None
+        self.error_log = open('error_log.txt','a' if resume else 'w') if logs else None
+        self.debug_log = open('debug_log.txt','a' if resume else 'w') if logs else None
+        self.has_errors = False
+        self.has_debug = False
+        self.usage_checks = 0
+        self.usage_differences = 0
+
+    def tool(self, record=None):
+        """ write page and store record of a tool, journal it if a journal is set """
+        if self.renderer:
+            self.page(*self.renderer.tool_page(record))
+        if self.store:
+            self.store.write(record)
+        if self.journal:
+            self.journal.add(record)
+
+    def library(self, record=None):
+        """ write page of a library, the record is stored in build order by the caller """
+        if self.renderer:
+            self.page(*self.renderer.library_page(record))
+
+    def page(self, fname=None, html=None):
+        """ write HTML page, html is either str, UTF-8 encoded bytes or an iterable of str pieces """
+        if type(html) == bytes:
+            self.writer.write(fname, html)
+        elif type(html) == str:
+            self.writer.write(fname, html.encode('utf8'))
+        else:
+            self.writer.write_stream(fname, html)
+
+    def static(self, src=None, subdir=None):
+        """ copy changed static files from directory src to subdir """
+        self.writer.sync(src, subdir)
+
+    def prune(self, subdir=None, keep=None):
+        """ remove files of subdir that are not in keep """
+        self.writer.prune(subdir, keep)
+
+    def error(self, console_msg=None, log_msg=None):
+        """ report error or warning on console and in error log """
+        print(console_msg)
+        self.log('error', log_msg)
+
+    def debug(self, log_msg=None):
+        """ add message to debug log """
+        self.log('debug', log_msg)
+
+    def verify(self, tool=None, diff=None):
+        """ count native usage check, add differences to debug log """
+        self.log('verify', "DEBUG: native usage of %s differs:\n%s\n\n" % (tool, diff) if diff else None)
+
+    def log(self, kind=None, log_msg=None):
+        """ write message to error or debug log, count native usage checks """
+        if kind == 'verify':
+            self.usage_checks += 1
+            if log_msg:
+                self.usage_differences += 1
+                self.debug_log.write(log_msg)
+                self.has_debug = True
+        elif kind == 'error':
+            self.error_log.write(log_msg)
+            self.has_errors = True
+        else:
+            self.debug_log.write(log_msg)
+            self.has_debug = True
+
+    def close(self):
+        """ swap in the written pages, finish error and debug messages """
+        if self.writer:
+            if self.compress:
+                start = time.perf_counter()
+                self.writer.compress(self.jobs)
+                profiler.stop('compress', start)
+            self.writer.commit()
+            print('\nwrote {} files to {}, skipped {} unchanged files'.format(self.writer.written, self.path, self.writer.skipped))
+        if self.error_log:
+            self.error_log.close()
+            self.debug_log.close()
+
+class CollectedOutput():
+    """ collect pages, tool records and log messages of one library in a worker process, the parent writes them """
+    def __init__(self, renderer=None):
+        """ start with empty lists """
+        self.renderer = renderer
+        self.reset()
+
+    def reset(self):
+        """ forget pages, records and messages of the previous library """
+        self.pages = []
+        self.records = []
+        self.messages = []
+
+    def tool(self, record=None):
+        """ render page and remember record of a tool """
+        if self.renderer:
+            self.page(*self.renderer.tool_page(record))
+        self.records.append(record)
+
+    def library(self, record=None):
+        """ render page of a library """
+        if self.renderer:
+            self.page(*self.renderer.library_page(record))
+
+    def page(self, fname=None, html=None):
+        """ remember encoded HTML page """
+        self.pages.append((fname, html.encode('utf8')))
+
+    def error(self, console_msg=None, log_msg=None):
+        """ report on console now, log later in library order """
+        print(console_msg)
+        self.messages.append(('error', log_msg))
+
+    def debug(self, log_msg=None):
+        """ log later in library order """
+        self.messages.append(('debug', log_msg))
+
+    def verify(self, tool=None, diff=None):
+        """ log native usage check later in library order """
+        self.messages.append(('verify', "DEBUG: native usage of %s differs:\n%s\n\n" % (tool, diff) if diff else None))
+
+class LibraryParser():
+    """ load tool libraries through saga_api and pass library and tool records to the output """
+    def __init__(self, args=None, output=None):
+        """ set up the saga_cmd worker pool """
+        import_saga_api()
+        self.args = args
+        self.output = output
+        self.wikilinks = util.get_wikilinks()
+
+        # saga_cmd calls run in a worker pool, tool records wait in submission order until their usage is resolved
+        # and their library is parsed, parsing waits for the oldest call once a limited number is queued to keep memory bounded
+        self.usage_pool = ThreadPoolExecutor(max_workers=max(1, args.jobs))
+        self.usage_limit = 4 * max(1, args.jobs)
+        self.usage_calls = deque()
+        self.pending_tools = deque()
+        self.parsing = None
+
+    def parse(self, fname=None, fingerprint=None, usage_tools=None):
+        """ parse library and report errors instead of aborting the build
+            returns the library record or None on errors
+        """
+        self.is_loaded = False
+        start = time.perf_counter()
+        try:
+            return self.parse_library(fname, fingerprint, usage_tools)
+        except Exception:
+            self.output.error(
+                'ERROR: parsing library {} failed after {:.1f} s'.format(fname, time.perf_counter() - start),
+                "ERROR: parsing library %s failed after %.1f s\n       %s\n" % (fname, time.perf_counter() - start, traceback.format_exc())
+            )
+            # drop the tools parsed so far, the failed library gets neither pages nor records
+            for usage, record, usage_tools, native in self.pending_tools:
+                if record['fname'] == fname:
+                    usage.cancel()
+            self.pending_tools = deque([pending for pending in self.pending_tools if pending[1]['fname'] != fname])
+            self.parsing = None
+            if self.is_loaded:
+                saga_api.SG_Get_Tool_Library_Manager().Del_Library(0)
+            return None
+        finally:
+            profiler.stop('library', start, library=fname)
+
+    def parse_library(self, fname=None, fingerprint=None, usage_tools=None):
+        """ parse library, pass its library record to the output and queue its tool records """
+        args = self.args
+
+        # load library
+        print('parsing {}/{} ...'.format(args.libpath,fname))
+        start = time.perf_counter()
+        saga_api.SG_Get_Tool_Library_Manager().Add_Library('%s/%s' % (args.libpath,fname))
+        profiler.stop('load_library', start)
+        self.is_loaded = True
+        self.parsing = fname
+
+        # define shortcut to library object
+        lib_obj = saga_api.SG_Get_Tool_Library_Manager().Get_Library(0)
+
+        # define unique name for library
+        lib_name = ''
+        if os.name == 'nt':
+            lib_name = util.lib_name_from_so('%s' % fname)
+        else:
+            lib_name = util.lib_name_from_so('%s/%s' % (args.libpath,fname))
+
+        # define library title as we will use it more than once
+        lib_title = '%s - %s' % (util.cstr_2_str(lib_obj.Get_Category()),util.cstr_2_str(lib_obj.Get_Name()) )
+
+        # remember library details - see dir(lib_obj)
+        library = {
+            'Get_Author' : util.cstr_2_str(lib_obj.Get_Author()),
+            'Get_Count' : lib_obj.Get_Count(),
+            'Get_Description' : util.cstr_2_str(lib_obj.Get_Description()),
+            'Get_File_Name' : util.cstr_2_str(lib_obj.Get_File_Name()),
+            'Get_Library_Name' : util.cstr_2_str(lib_obj.Get_Library_Name()),
+            'Get_Menu' : util.cstr_2_str(lib_obj.Get_Menu()),
+            'Get_Name' : util.cstr_2_str(lib_obj.Get_Name()),
+            'Get_Version' : util.cstr_2_str(lib_obj.Get_Version()),
+            'is_Valid' : lib_obj.is_Valid(),
+            'doc_Links' : {},    # will be filled while parsing tools
+        }
+
+        # resolve WIKI link if any
+        if lib_name in self.wikilinks:
+            library['WIKI_Link'] = self.wikilinks[lib_name]
+        else:
+            library['WIKI_Link'] = None
+
+        # library record, tools lists (tool title, link, menu path) in library order for the a2z index
+        lib_record = {
+            'kind' : 'library',
+            'fname' : fname,
+            'fingerprint' : fingerprint,
+            'is_Complete' : not args.tool,
+            'lib_name' : lib_name,
+            'lib_title' : lib_title,
+            'library' : library,
+            'tools' : [],
+            'usage_hits' : 0,
+            'usage_misses' : 0,
+        }
+
+        # loop through library tools and collect details
+        for i in range(0,library['Get_Count']):
+            # load tool
+            tool_obj = lib_obj.Get_Tool(i)
+            tool_obj_id = tool_obj.Get_ID()
+
+            # make sure that tool is valid
+            if not 'Get_Name' in dir(tool_obj):
+                continue
+
+            # skip tool if needed
+            if args.tool and "%s_%s" % (lib_name, tool_obj_id.c_str()) != args.tool:
+                continue
+
+            # remember tool details - see dir(tool_obj), parameters are parsed first to time them on their own
+            #print "DEBUG: %s_%s" % (lib_name, tool_obj_id.c_str())
+            tool_key = "%s_%s" % (lib_name, tool_obj_id.c_str())
+            start = time.perf_counter()
+            parameters = util.parse_parameters(tool_obj)
+            profiler.stop('parse_parameters', start, tool=tool_key)
+            start = time.perf_counter()
+            details = {
+                'Get_Author' : util.cstr_2_str(tool_obj.Get_Author()),
+                'Get_Description' : util.cstr_2_str(tool_obj.Get_Description()),
+                'Get_References' : util.toolreferences_2_str(tool_obj.Get_References()),
+                'Get_ID' : tool_obj_id.c_str(),
+                'Get_MenuPath' : util.cstr_2_str(tool_obj.Get_MenuPath()),
+                'Get_Name' : util.cstr_2_str(tool_obj.Get_Name()),
+                'Get_Parameters' : parameters,
+                'Get_Parameters_Count' : tool_obj.Get_Parameters_Count(),
+                'Get_Type' : tool_obj.Get_Type(),
+                'is_Grid' : tool_obj.is_Grid(),
+                'is_Interactive' : tool_obj.is_Interactive(),
+                'needs_GUI' : False if not hasattr(tool_obj,'needs_GUI') else tool_obj.needs_GUI()    # introduced in https://sourceforge.net/p/saga-gis/code-0/2111/
+            }
+            profiler.stop('tool_details', start, tool=tool_key)
+
+            # replace \n  with <br> in tool description
+            details['Get_Description_HTML'] = util.add_brs(details['Get_Description'])
+
+            # resolve full path for menu entry
+            details['Full_Menu_Path'] = library['Get_Menu']
+            if details['Get_MenuPath'] != "":
+                if  details['Get_MenuPath'][:2] == 'R:':
+                    details['Full_Menu_Path'] += "|%s" % details['Get_MenuPath'][2:]
+                elif  details['Get_MenuPath'][:2] == 'A:':
+                    details['Full_Menu_Path'] = details['Get_MenuPath'][2:]
+                else:
+                    details['Full_Menu_Path'] += "|%s" % details['Get_MenuPath']    # same as R: according to olaf
+
+            # resolve WIKI link if any
+            if ("%s_%s" % (lib_name,i)) in self.wikilinks:
+                details['WIKI_Link'] = self.wikilinks["%s_%s" % (lib_name,tool_obj_id.c_str())]
+            else:
+                details['WIKI_Link'] = None
+
+            # define tool title that will be used in index and a2z pages consisting of tool name and interactive switch
+            tool_title = "%s%s" % (
+                util.cstr_2_str(tool_obj.Get_Name()),
+                ' (interactive)' if details['is_Interactive'] else ''
+            )
+
+            # remember links to tool docs by title
+            library['doc_Links'][tool_title] = '%s_%s.html' % (lib_name, tool_obj_id.c_str())
+
+            # fill a2z index, use list approach to ensure that duplicate tool names in different libraries don't get lost
+            lib_record['tools'].append((tool_title, '%s_%s.html' % (lib_name, tool_obj_id.c_str()), details['Full_Menu_Path']))
+
+            # unload tool
+            tool_obj.Destroy()
+
+            # list tools with clashing is_Interactive and needs_GUI switches
+            if not details['is_Interactive'] == details['needs_GUI']:
+                self.output.debug("DEBUG: %s has is_Interactive=%s and needs_GUI=%s\n" % (
+                    tool_title,details['is_Interactive'],details['needs_GUI']
+                ))
+
+            record = {
+                'kind' : 'tool',
+                'fname' : fname,
+                'lib_name' : lib_name,
+                'lib_title' : lib_title,
+                'tool_id' : tool_obj_id.c_str(),
+                'tool_title' : tool_title,
+                'details' : details,
+            }
+
+            # resolve saga_cmd usage for tools that do not need the GUI or are non-interactive, native usage is built from the parameters
+            # saga_cmd calls are queued and the record is passed on once they are resolved, in verify mode both are compared for a sample of tools
+            entry = None
+            native = None
+            if details['is_Interactive']:
+                entry = {'Saga_Cmd' : 'this interactive tool can not be executed.', 'messages' : []}
+            elif args.usage != 'subprocess':
+                start = time.perf_counter()
+                native = format_usage(lib_name, tool_obj_id.c_str(), details['needs_GUI'],
+                    *util.get_native_usage(lib_name, tool_obj_id.c_str(), details['Get_Parameters'], details['needs_GUI']))
+                profiler.stop('native_usage', start, tool=tool_key)
+                if args.usage == 'native' or not util.is_sampled(record['fname'] + record['tool_id'], args.usage_sample):
+                    entry = native
+                    native = None
+            if entry is None and usage_tools is not None:
+                entry = usage_tools.get(tool_obj_id.c_str())
+                if entry:
+                    lib_record['usage_hits'] += 1
+                else:
+                    lib_record['usage_misses'] += 1
+            if entry:
+                usage = Future()
+                usage.set_result(entry)
+            else:
+                usage = self.usage_pool.submit(resolve_usage, lib_name, tool_obj_id.c_str(), details['needs_GUI'], args.cmd_timeout, args.cmd_retries)
+                self.usage_calls.append(usage)
+            self.pending_tools.append((usage, record, usage_tools if entry is None else None, native))
+            self.flush()
+            self.limit()
+
+        # unload library
+        saga_api.SG_Get_Tool_Library_Manager().Del_Library(0)
+        self.is_loaded = False
+        self.parsing = None
+        self.flush()
+
+        # create index page for tools in library
+        self.output.library(lib_record)
+        return lib_record
+
+    def limit(self):
+        """ wait for the oldest saga_cmd calls while more than the limit are queued or running, then pass on resolved tool records """
+        while self.usage_calls and self.usage_calls[0].done():
+            self.usage_calls.popleft()
+        if len(self.usage_calls) <= self.usage_limit:
+            return
+        while len(self.usage_calls) > self.usage_limit:
+            wait_futures([self.usage_calls.popleft()])
+        self.flush()
+
+    def flush(self, wait=False):
+        """ pass tool records to the output in submission order, stop at the first unresolved one unless wait is set
+            and at the first one of the library that is being parsed
+        """
+        while self.pending_tools:
+            usage, record, usage_tools, native = self.pending_tools[0]
+            if record['fname'] == self.parsing:
+                break
+            if not wait and not usage.done():
+                break
+            entry = usage.result()
+            if usage_tools is not None and not entry.get('timed_out'):
+                usage_tools[record['tool_id']] = entry
+
+            # compare native usage with saga_cmd output in verify mode
+            if native:
+                diff = difflib.unified_diff(entry['Saga_Cmd'].split('\n'), native['Saga_Cmd'].split('\n'), 'saga_cmd', 'native', lineterm='')
+                self.output.verify('saga_cmd %s %s' % (record['lib_name'], record['tool_id']), '\n'.join(diff))
+
+            # log messages of the resolved usage entry
+            for console_msg, log_msg in entry['messages']:
+                self.output.error(console_msg, log_msg)
+            record['Saga_Cmd'] = entry['Saga_Cmd']
+            record['Saga_Cmd_Spec'] = entry.get('spec')
+            self.output.tool(record)
+            self.pending_tools.popleft()
+
+    def close(self):
+        """ wait for remaining saga_cmd calls """
+        self.flush(wait=True)
+        self.usage_pool.shutdown()
+
+def resolve_usage(lib_name=None, tool_id=None, needs_GUI=False, timeout=None, retries=0):
+    """ call saga_cmd and post-process its output - runs in worker threads
+        calls that take longer than timeout seconds are killed and tried again up to retries times,
+        the entry of a tool that timed out every time is marked with 'timed_out' and not cached
+    """
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        try:
+            out, err = util.run_saga_cmd(lib_name, tool_id, timeout)
+            break
+        except subprocess.TimeoutExpired:
+            continue
+    else:
+        seconds = time.perf_counter() - start
+        profiler.stop('saga_cmd', start, tool="%s_%s" % (lib_name, tool_id))
+        return {'out' : None, 'err' : None, 'Saga_Cmd' : 'ERROR: saga_cmd timed out', 'spec' : None, 'timed_out' : True, 'messages' : [(
+            'ERROR: saga_cmd {} {} timed out {} times after {} s ({:.1f} s)'.format(lib_name, tool_id, retries + 1, timeout, seconds),
+            "ERROR: saga_cmd %s %s timed out %d times after %s s (%.1f s)\n" % (lib_name, tool_id, retries + 1, timeout, seconds)
+        )]}
+    seconds = time.perf_counter() - start
+    profiler.stop('saga_cmd', start, tool="%s_%s" % (lib_name, tool_id))
+    return format_usage(lib_name, tool_id, needs_GUI, out, err, seconds)
+
+def format_usage(lib_name=None, tool_id=None, needs_GUI=False, out=None, err=None, seconds=None):
+    """ post-process saga_cmd output, messages are returned for logging in order
+        returns dictionary with raw output, usage text for the Saga_Cmd term, usage spec and messages for console and error log,
+        errors of saga_cmd calls are logged with the given duration
+    """
+    entry = {'out' : out, 'err' : err, 'Saga_Cmd' : '', 'spec' : None, 'messages' : []}
+    if err:
+        if needs_GUI:
+            # set GUI hint as cmd usage
+            entry['Saga_Cmd'] = re.sub('Error: ','',err)
+        else:
+            entry['messages'].append((
+                'ERROR: saga_cmd {} {} '.format(lib_name, tool_id),
+                "ERROR: saga_cmd %s %s%s\n       %s\n" % (lib_name,tool_id,'' if seconds is None else ' (failed after %.2f s)' % seconds,err)
+            ))
+            entry['Saga_Cmd'] = "ERROR: %s" % err
+    if out and not needs_GUI:
+        # parse tool usage into a spec and render the usage text from it
+        entry['spec'] = parse_usage(lib_name, tool_id, out)
+        if entry['spec'] is None:
+            entry['messages'].append((
+                'NOTICE: saga_cmd {} {} has no, or unknown usage string. Please check.'.format(lib_name, tool_id),
+                "WARNING: saga_cmd %s %s has no, or unknown usage string:\n[]\n\n" % (lib_name,tool_id)
+            ))
+            entry['Saga_Cmd'] = ''
+        else:
+            entry['Saga_Cmd'] = render_usage(entry['spec'])
+    return entry
+
+def parse_usage(lib_name=None, tool_id=None, out=None):
+    """ parse saga_cmd output in one pass into a usage spec, None if it has no usage line
+        {'library', 'tool', 'usage', 'lines', 'options' : [{'identifier', 'type', 'required', 'name', 'description', 'choices', 'minimum', 'maximum', 'default', 'lines'}]}
+        options are taken from the usage line, which marks optional ones with brackets, and completed by their flag lines,
+        choices and ranges are present only if saga_cmd lists them, other property lines are kept as description;
+        the usage line, the lines before the first flag line and the lines of every option are kept verbatim for render_usage(),
+        if flag lines repeat or are not in the order of the options all lines after the usage line stay in the spec's lines
+    """
+    spec = None
+    options = {}
+    option = None
+    blocks = []
+    lines = []
+    for line in out.split('\n'):
+        if spec is None:
+            # skip the version and tool header
+            if line[:5] != 'Usage':
+                continue
+            spec = {'library' : lib_name, 'tool' : tool_id, 'usage' : line, 'lines' : [], 'options' : []}
+            match = USAGE_LINE.match(line)
+            if match:
+                for match in USAGE_OPTION.finditer(match.group('options')):
+                    option = {'identifier' : match.group('identifier'), 'type' : match.group('type'), 'required' : not match.group('optional'), 'name' : '', 'description' : [], 'lines' : []}
+                    options[option['identifier']] = option
+                    spec['options'].append(option)
+                option = None
+            continue
+        lines.append(line)
+
+        # flag lines of switches are only taken for switches of the usage line
+        match = USAGE_FLAG.match(line)
+        if match and (match.group('type') is not None or match.group('identifier') in options):
+            option = options.get(match.group('identifier'))
+            if option is None:
+                option = {'identifier' : match.group('identifier'), 'type' : match.group('type'), 'required' : False, 'name' : '', 'description' : [], 'lines' : []}
+                options[option['identifier']] = option
+                spec['options'].append(option)
+            option['name'] = match.group('name') or ''
+            option['lines'].append(line)
+            blocks.append(option['identifier'])
+            continue
+
+        if option is None:
+            spec['lines'].append(line)
+            continue
+        option['lines'].append(line)
+        text = line.strip()
+        if not text:
+            continue
+        if text == 'Available Choices:':
+            option['choices'] = []
+            continue
+        match = USAGE_CHOICE.match(text)
+        if match and 'choices' in option:
+            option['choices'].append([match.group('value'), match.group('label')])
+            continue
+        match = USAGE_PROPERTY.match(text)
+        if match:
+            option[match.group('key').lower()] = match.group('value')
+            continue
+        option['description'].append(text)
+
+    # keep the original line order if the option blocks can not be rendered in option order
+    if spec is not None and blocks != [option['identifier'] for option in spec['options'] if option['lines']]:
+        spec['lines'] = lines
+        for option in spec['options']:
+            option['lines'] = []
+    return spec
+
+def render_usage(spec=None):
+    """ return the usage text of the Saga_Cmd term from the verbatim lines of a usage spec with the command in bold and "<" escaped,
+        the command is added to usage lines of saga_cmd prior to 2.1.3 that lack library and tool
+    """
+    command = 'saga_cmd %s %s' % (spec['library'], spec['tool'])
+    lines = [spec['usage']] + spec['lines']
+    for option in spec['options']:
+        lines.extend(option['lines'])
+
+    usage = []
+    for line in lines:
+        if not command in line:
+            line = line.replace('saga_cmd', command)
+        usage.append(line.replace('<', '&lt;').replace(command, '<strong>%s</strong>' % command))
+    return '\n'.join(usage)
+
+def get_compress_suffixes():
+    """ return file name suffixes of the available codecs: gzip always, brotli if installed and zstd if the stdlib has it (Python 3.14+) """
+    suffixes = ['.gz']
+    if importlib.util.find_spec('brotli'):
+        suffixes.append('.br')
+    try:
+        if importlib.util.find_spec('compression.zstd'):
+            suffixes.append('.zst')
+    except ImportError:
+        pass
+    return suffixes
+
+def install_file(fpath=None, target=None, objects=None):
+    """ move the finished temporary file fpath to target - safe to run in worker threads and processes
+        with an object store, fpath is moved into it unless an identical object exists and target becomes a hard link to the object,
+        existing objects are left untouched, so files of other version trees linking them keep their modification time
+    """
+    if not objects:
+        os.replace(fpath, target)
+        return
+    digest = util.get_sha1(fpath)
+    obj = os.path.join(objects, digest[:2], digest[2:])
+    if os.path.exists(obj):
+        os.remove(fpath)
+    else:
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        os.replace(fpath, obj)
+    os.link(obj, fpath)
+    os.replace(fpath, target)
+
+def compress_file(fpath=None, suffixes=None, objects=None, digest=None):
+    """ write compressed siblings of a file that are missing or were compressed from other content - runs in worker processes
+        digest is the SHA1 of the content the existing siblings were compressed from
+        returns (file size, [(suffix, sibling size)], True if a sibling was written, SHA1 of the file)
+    """
+    data = None
+    sizes = []
+    is_written = False
+    sha1 = util.get_sha1(fpath)
+    for suffix in suffixes:
+        target = fpath + suffix
+        if sha1 != digest or not os.path.exists(target):
+            if data is None:
+                with open(fpath, 'rb') as f:
+                    data = f.read()
+            if suffix == '.gz':
+                # no timestamp in the header, unchanged content gives identical files
+                packed = gzip.compress(data, compresslevel=9, mtime=0)
+            elif suffix == '.br':
+                import brotli
+                packed = brotli.compress(data)
+            else:
+                from compression import zstd
+                packed = zstd.compress(data, level=19)
+            with open(target + '.tmp', 'wb') as f:
+                f.write(packed)
+            install_file(target + '.tmp', target, objects)
+            is_written = True
+        sizes.append((suffix, os.path.getsize(target)))
+    return os.path.getsize(fpath), sizes, is_written, sha1
+
+def library_worker(worker_id=None, args=None, tasks=None, conn=None):
+    """ worker process with its own saga_api instance, parses libraries from the task queue
+        sends ('start', index) before and ('done', index, lib_record, pages, messages, tool_records, usage_tools, samples) after each library
+    """
+    profiler.enabled = args.profile is not None
+    renderer = None
+    if args.command == 'build':
+        import_saga_api()
+        renderer = PageRenderer(util.get_saga_version(), args.debugjson, shared=args.dedup)
+    output = CollectedOutput(renderer)
+    parser = LibraryParser(args, output)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        index, fname, fingerprint, usage_tools = task
+        conn.send(('start', index))
+        output.reset()
+        lib_record = parser.parse(fname, fingerprint, usage_tools)
+        parser.flush(wait=True)
+        if lib_record is None:
+            # only the messages of a failed library are passed on
+            output.pages = []
+            output.records = []
+        conn.send(('done', index, lib_record, output.pages, output.messages, output.records, usage_tools, profiler.collect()))
+    parser.close()
+    conn.close()
+
+def parse_in_processes(args=None, tasks=None):
+    """ spread libraries over worker processes, restart workers that crash
+        tasks is a list of (index, fname, fingerprint, usage_tools), yields (index, lib_record, pages, messages, tool_records, usage_tools, samples) as libraries finish,
+        every task is yielded once, libraries left over when all workers are gone are yielded as failed
+    """
+    ctx = multiprocessing.get_context('spawn')
+    task_queue = ctx.Queue()
+    for task in tasks:
+        task_queue.put(task)
+    fnames = dict((task[0], task[1]) for task in tasks)
+    pending = set(fnames)
+    exitcodes = []
+
+    # messages are sent through one pipe per worker, a closed pipe means that the worker has finished or died
+    workers = {}
+    current = {}
+    def start_worker(worker_id):
+        reader, writer = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=library_worker, args=(worker_id, args, task_queue, writer), daemon=True)
+        proc.start()
+        writer.close()
+        workers[reader] = (worker_id, proc)
+
+    for worker_id in range(min(args.processes, len(tasks))):
+        task_queue.put(None)
+        start_worker(worker_id)
+    next_id = len(workers)
+
+    while workers:
+        for reader in multiprocessing.connection.wait(list(workers.keys())):
+            worker_id, proc = workers[reader]
+            try:
+                msg = reader.recv()
+            except EOFError:
+                del workers[reader]
+                proc.join()
+                exitcodes.append(proc.exitcode)
+                if worker_id in current:
+                    index = current.pop(worker_id)
+                    pending.discard(index)
+                    print('ERROR: worker process crashed while parsing {}'.format(fnames[index]))
+                    yield index, None, [], [('error', "ERROR: worker process crashed while parsing library %s (exit code %s)\n" % (fnames[index], proc.exitcode))], [], None, None
+
+                    # the crashed worker did not take its stop signal from the queue, a replacement does
+                    start_worker(next_id)
+                    next_id += 1
+                continue
+
+            if msg[0] == 'start':
+                current[worker_id] = msg[1]
+            else:
+                del current[worker_id]
+                pending.discard(msg[1])
+                yield msg[1:]
+
+    # workers that die before taking a task, e.g. when saga_api fails to import, leave their libraries unparsed,
+    # their tasks are dropped from the queue, so the process does not wait for it to be read at exit
+    task_queue.cancel_join_thread()
+    for index in sorted(pending):
+        print('ERROR: no worker process left to parse {}'.format(fnames[index]))
+        yield index, None, [], [('error', "ERROR: library %s was not parsed, all worker processes exited (exit codes %s)\n" % (
+            fnames[index], ', '.join([str(exitcode) for exitcode in exitcodes])
+        ))], [], None, None
+
+def write_changes(store=None, version=None, since=None):
+    """ compare tool records with the stored build of an older version, write the report next to the store and print a summary """
+    old_store = MetadataStore(store.get_archive_path(since))
+    if not os.path.exists(old_store.fpath):
+        print('\nWARNING: no metadata store of version {} to compare with at {}'.format(since, old_store.fpath))
+        return
+    old = old_store.get_tool_digests()
+    if old is None:
+        print('\nWARNING: metadata store {} has an outdated format, can not compare with version {}'.format(old_store.fpath, since))
+        return
+    new = store.get_tool_digests()
+
+    report = {'version' : version, 'since' : since, 'added' : [], 'removed' : [], 'changed' : [], 'unchanged' : 0}
+    for tool in sorted(new):
+        title, fields = new[tool]
+        if not tool in old:
+            report['added'].append({'tool' : tool, 'title' : title})
+        elif old[tool][1] != fields:
+            # name the details that differ, e.g. Get_Parameters or Saga_Cmd
+            old_fields = old[tool][1]
+            report['changed'].append({'tool' : tool, 'title' : title, 'fields' : sorted(
+                [key for key in set(fields) | set(old_fields) if fields.get(key) != old_fields.get(key)]
+            )})
+        else:
+            report['unchanged'] += 1
+    for tool in sorted(old):
+        if not tool in new:
+            report['removed'].append({'tool' : tool, 'title' : old[tool][0]})
+
+    fpath = '%s/changes-%s-to-%s.json' % (os.path.dirname(store.fpath) or '.', since, version)
+    with open(fpath, 'w') as f:
+        simplejson.dump(report, f, indent=1)
+    print('\nchanged tools since v{}: {} added, {} removed, {} changed, {} unchanged, see {}'.format(
+        since, len(report['added']), len(report['removed']), len(report['changed']), report['unchanged'], fpath
+    ))
+
+def write_cli_spec(store=None, version=None):
+    """ write the usage specs of all tools to one JSON file next to the store, e.g. ./store/saga_cmd-9.1.0.json
+        options are completed by data type and direction of the tool parameter with the same identifier,
+        so saga_cmd calls can be checked without running saga_cmd
+    """
+    tools = {}
+    for record in store.read():
+        if record['kind'] != 'tool' or not record.get('Saga_Cmd_Spec'):
+            continue
+        params = {}
+        for section in record['details']['Get_Parameters']:
+            for param in map(Parameter._make, record['details']['Get_Parameters'][section]):
+                params[param.Get_Identifier] = (param.Get_Type_Identifier, {'Input' : 'input', 'Output' : 'output'}.get(section, 'option'))
+        # the verbatim usage lines are only needed for the Saga_Cmd text
+        spec = dict((key, value) for key, value in record['Saga_Cmd_Spec'].items() if not key in ('usage', 'lines'))
+        spec['options'] = [dict((key, value) for key, value in option.items() if key != 'lines') for option in spec['options']]
+        for option in spec['options']:
+            if option['identifier'] in params:
+                option['data_type'], option['direction'] = params[option['identifier']]
+        spec['title'] = record['tool_title']
+        tools["%s %s" % (record['lib_name'], record['tool_id'])] = spec
+
+    fpath = '%s/saga_cmd-%s.json' % (os.path.dirname(store.fpath) or '.', version)
+    with open(fpath + '.tmp', 'w') as f:
+        simplejson.dump({'version' : version, 'tools' : dict(sorted(tools.items()))}, f, ensure_ascii=False, separators=(',',':'))
+    os.replace(fpath + '.tmp', fpath)
+    print('wrote saga_cmd usage of {} tools to {}'.format(len(tools), fpath))
+
+def write_search_index(output=None, store=None):
+    """ write search index shards of all tool records in the store, drop shards that are no longer needed """
+    search_index = SearchIndex()
+    for record in store.read():
+        if record['kind'] == 'tool':
+            search_index.add(record)
+    shards = search_index.get_shards()
+    for shard in shards:
+        output.page('search/%s.json' % shard, simplejson.dumps(shards[shard], ensure_ascii=False, separators=(',',':')))
+    output.page('search/tools.json', simplejson.dumps({'tools' : search_index.tools, 'shards' : sorted(shards)}, ensure_ascii=False, separators=(',',':')))
+    output.prune('search', ['%s.json' % shard for shard in shards] + ['tools.json'])
+
+def write_facet_pages(output=None, renderer=None, store=None):
+    """ write data type and menu pages and their indexes as facets.json from the tool records in the store """
+    facets = FacetIndex()
+    for record in store.read():
+        if record['kind'] == 'tool':
+            facets.add(record)
+    facets.sort()
+    output.page("types.html", renderer.types_page(facets))
+    output.page("menus.html", renderer.menus_page(facets))
+    output.page("facets.json", facets.as_json())
+
+def write_debug_files(output=None, index=None, store=None):
+    """ write debug JSON sidecars of all tool and library records in the store, the details of all libraries for the index
+        pages and all records as JSON Lines in debug/debug.jsonl for scripts, ordered by library and file name
+    """
+    keep = ['index.json', 'debug.jsonl']
+    order = []
+    for offset, record in store.scan():
+        if record['kind'] == 'tool':
+            name = "%s_%s" % (record['lib_name'], record['tool_id'])
+            output.page('debug/%s.json' % name, util.as_json(util.expand_parameters(record['details'])))
+        elif record['kind'] == 'library':
+            name = record['lib_name']
+            output.page('debug/%s.json' % name, util.as_json(record['library']))
+        else:
+            continue
+        keep.append('%s.json' % name)
+        order.append(((record['lib_name'], record['kind'] != 'library', name), offset))
+    order.sort()
+    output.page('debug/index.json', util.iter_json(index.get_details(store)))
+    output.page('debug/debug.jsonl', (
+        simplejson.dumps(record, ensure_ascii=False, sort_keys=True) + '\n' for record in store.read_at([offset for key, offset in order])
+    ))
+    output.prune('debug', keep)
+
+def write_index_pages(output=None, renderer=None, index=None, store=None):
+    """ write index, a2z and facet pages and copy static files """
+    start = time.perf_counter()
+    output.page("index.html", renderer.index_page(index, store))
+    output.page("a2z.html", renderer.a2z_page(index, store))
+    output.page("version.js", renderer.version_script())
+    profiler.stop('index_pages', start)
+
+    # pages by data type and menu path
+    start = time.perf_counter()
+    write_facet_pages(output, renderer, store)
+    profiler.stop('facet_pages', start)
+
+    # search index over the tool records of the store
+    start = time.perf_counter()
+    write_search_index(output, store)
+    profiler.stop('search_index', start)
+
+    # debug JSON sidecars, dropped by builds without --debugjson
+    start = time.perf_counter()
+    if renderer.debugjson:
+        write_debug_files(output, index, store)
+    else:
+        output.prune('debug', [])
+    profiler.stop('debug_json', start)
+
+    # copy changed files of lib/ and icons/ directories to html-path
+    print('\ncopying ./html/lib/ and ./html/icons/ directory to {} ...'.format(output.path))
+    start = time.perf_counter()
+    for subdir in ('lib','icons'):
+        output.static("./html/%s" % subdir, subdir)
+    profiler.stop('static_files', start)
+
+def extract(args=None):
+    """ parse libraries and write the metadata store, render pages too unless only extracting """
+    import_saga_api()
+    version = util.get_saga_version()
+    is_build = args.command == 'build'
+
+    page_index = PageIndex()
+
+    # find library records of the previous build before the store is rewritten
+    store = MetadataStore(args.store)
+    stored = store.get_libraries(version, args.usage) if args.incremental else {}
+    store.create(version, args.usage)
+
+    renderer = None
+    html_path = None
+    manifest = None
+    if is_build:
+        # target directory with version number for docs
+        html_path = "%s/%s" % (HTML_PATH,version)
+        renderer = PageRenderer(version, args.debugjson, shared=args.dedup)
+
+    # pages are written to a staging copy of html/<version> that replaces it at the end
+    output = BuildOutput(html_path, renderer, store, jobs=args.jobs, compress=args.compress, objects=OBJECTS_PATH if args.dedup else None, resume=args.resume)
+
+    # finished libraries are checkpointed to a journal in the staging directory, or next to the store if only extracting,
+    # once their pages are written, --resume takes libraries of an interrupted run from there
+    output.journal = BuildJournal(
+        "%s/build_journal.jsonl" % output.writer.staging if is_build else args.store + '.journal',
+        "%s %s" % (args.command, util.get_build_key(version, args.debugjson, args.usage, args.dedup)),
+        output.writer.wait if is_build else None
     )
+    resumed = output.journal.load() if args.resume else {}
+    output.journal.open()
+
+    if is_build:
+        # load build manifest, pages of unchanged libraries are reused in incremental mode only
+        manifest = BuildManifest(html_path, util.get_build_key(version, args.debugjson, args.usage, args.dedup))
+        if not args.incremental:
+            manifest.stale.update(manifest.libraries)
+            manifest.libraries = {}
+
+    # load persistent saga_cmd usage cache
+    usage_cache = None
+    if not args.no_cache:
+        usage_cache = UsageCache(args.cache, version, args.refresh_cache)
+
+    # collect libraries to parse, unchanged ones are taken from the previous store
+    todo = []
+    for fname in os.listdir(args.libpath):
+        # parse optional commandline options
+        if args.lib and util.lib_name_from_so(fname) != args.lib:
+            continue
+        if args.tool and not re.match(r'^%s_[0-9]+$' % util.lib_name_from_so(fname), args.tool):
+            continue
+
+        if os.name == 'nt':
+            if fname[-4:] != '.dll':
+                continue
+        else:
+            if fname[-3:] != '.so':
+                continue
+
+        if args.skip and util.lib_name_from_so(fname) in args.skip.split(','):
+            print('SKIPPING library {} as requested ...'.format(util.lib_name_from_so(fname)))
+            continue
+
+        start = time.perf_counter()
+        fingerprint = util.get_fingerprint('%s/%s' % (args.libpath,fname))
+        profiler.stop('fingerprint', start)
+        cached = stored.get(fname)
+        if fname in resumed and resumed[fname][0] == fingerprint and not args.tool:
+            print('finished {}/{} before the interruption, using journal ...'.format(args.libpath,fname))
+            todo.append((fname, fingerprint, 'journal'))
+        elif cached and cached[0] == fingerprint and not args.tool and (not is_build or manifest.get(fname, fingerprint)):
+            print('unchanged {}/{}, using metadata store ...'.format(args.libpath,fname))
+            todo.append((fname, fingerprint, cached[1]))
+        else:
+            todo.append((fname, fingerprint, None))
+
+    # only a store of all libraries is archived for --since, not the one of a run with --lib, --tool or --skip or of a run whose workers crashed
+    processed_libraries = set()
+
+    def finish_library(fname=None, fingerprint=None, lib_record=None, cached=None):
+        """ store library record in build order, add it to the index pages and journal it
+            unchanged libraries are read from the given byte offset of the previous store,
+            libraries finished before an interruption are taken from the journal, their pages are written already
+        """
+        processed_libraries.add(fname)
+        if cached == 'journal':
+            fingerprint, tool_records, lib_record = resumed[fname]
+            for record in tool_records:
+                store.write(record)
+            page_index.add(lib_record, store.write(lib_record))
+            if manifest:
+                manifest.put(fname, fingerprint)
+            return
+        if cached is not None:
+            for lib_record in store.read_at([cached]):
+                page_index.add(lib_record, store.write(lib_record))
+            return
+        usage_hits = lib_record.pop('usage_hits', 0)
+        usage_misses = lib_record.pop('usage_misses', 0)
+        page_index.add(lib_record, store.write(lib_record))
+        output.journal.finish(lib_record)
+        if manifest and lib_record['is_Complete']:
+            manifest.put(fname, fingerprint)
+        if usage_cache:
+            usage_cache.hits += usage_hits
+            usage_cache.misses += usage_misses
+
+    def get_usage_tools(fname=None, fingerprint=None):
+        """ return cached saga_cmd usage entries of a library if the cache is enabled """
+        if usage_cache:
+            return usage_cache.get_tools(util.lib_name_from_so(fname), fingerprint)
+        return None
+
+    if args.processes > 1:
+        # parse libraries in worker processes, write pages and tool records as they arrive, everything else in library order
+        tasks = []
+        for index, (fname, fingerprint, cached) in enumerate(todo):
+            if cached is None:
+                tasks.append((index, fname, fingerprint, get_usage_tools(fname, fingerprint)))
+        finished = {}
+        next_index = 0
+        for index, lib_record, pages, messages, tool_records, usage_tools, samples in parse_in_processes(args, tasks):
+            if samples:
+                profiler.merge(samples)
+            for fname, html in pages:
+                output.page(fname, html)
+            for record in tool_records:
+                store.write(record)
+                output.journal.add(record)
+            if lib_record and usage_cache:
+                usage_cache.set_tools(lib_record['lib_name'], usage_tools)
+            # libraries of crashed or lost workers come without samples, the run is incomplete then
+            finished[index] = (lib_record, messages, samples is not None)
+            while next_index < len(todo) and (todo[next_index][2] is not None or next_index in finished):
+                fname, fingerprint, cached = todo[next_index]
+                if cached is not None:
+                    finish_library(fname, fingerprint, cached=cached)
+                else:
+                    lib_record, messages, is_processed = finished.pop(next_index)
+                    for kind, log_msg in messages:
+                        output.log(kind, log_msg)
+                    if is_processed:
+                        processed_libraries.add(fname)
+                    if lib_record:
+                        finish_library(fname, fingerprint, lib_record)
+                next_index += 1
+        for fname, fingerprint, cached in todo[next_index:]:
+            if cached is not None:
+                finish_library(fname, fingerprint, cached=cached)
+    else:
+        lib_parser = LibraryParser(args, output)
+        for fname, fingerprint, cached in todo:
+            if cached is not None:
+                finish_library(fname, fingerprint, cached=cached)
+                continue
+            lib_record = lib_parser.parse(fname, fingerprint, get_usage_tools(fname, fingerprint))
+            processed_libraries.add(fname)
+            if lib_record:
+                finish_library(fname, fingerprint, lib_record)
+
+        # wait for remaining saga_cmd calls
+        lib_parser.close()
+
+    store.close(set([fname for fname, fingerprint, cached in todo if cached is not None and cached != 'journal']))
+    is_full = not (args.lib or args.tool or args.skip) and len(processed_libraries) == len(todo)
+    if is_full:
+        store.archive(version)
+    print('\nwrote metadata store {}'.format(args.store))
+    if not is_full:
+        print('not all libraries were parsed, kept {}'.format(store.get_archive_path(version)))
+    write_cli_spec(store, version)
+    if usage_cache:
+        usage_cache.save()
+
+    if is_build:
+        manifest.save(args.libpath, output.writer.staging)
+        write_index_pages(output, renderer, page_index, store)
+
+    # the build is complete, finish error and debug messages
+    output.journal.remove()
+    output.close()
+
+    if args.since and is_full:
+        write_changes(store, version, args.since)
+    elif args.since:
+        print('\nno changes since {} reported for a build of some libraries only'.format(args.since))
+
+    if usage_cache:
+        print('\nsaga_cmd usage cache: {} hits, {} misses'.format(usage_cache.hits, usage_cache.misses))
+    if args.usage == 'verify':
+        print('\nnative usage: {} of {} checked tools differ from saga_cmd'.format(output.usage_differences, output.usage_checks))
+    if output.has_errors:
+        print('\nlogged ERRORS to error_log.txt')
+    if output.has_debug:
+        print('\nlogged DEBUG messages to debug_log.txt')
+
+def render(args=None):
+    """ build the html/<version> tree from the metadata store, saga_api is not needed """
+    store = MetadataStore(args.store)
+    version = store.get_version()
+    if version is None:
+        sys.exit('ERROR: metadata store {} has an outdated format, run build or extract again'.format(args.store))
+
+    page_index = PageIndex()
+
+    # target directory with version number for docs, pages are written to a staging copy that replaces it at the end
+    html_path = "%s/%s" % (HTML_PATH,version)
+    renderer = PageRenderer(version, args.debugjson, shared=args.dedup)
+    output = BuildOutput(html_path, renderer, logs=False, jobs=args.jobs, compress=args.compress, objects=OBJECTS_PATH if args.dedup else None)
+    manifest = BuildManifest(html_path, util.get_build_key(version, args.debugjson, store.get_usage(), args.dedup))
+
+    # tool pages are rendered in one batch while reading, library pages as their records come by, only index entries are kept
+    def tool_records():
+        for offset, record in store.scan():
+            if record['kind'] == 'tool':
+                yield record
+            elif record['kind'] == 'library':
+                output.library(record)
+                page_index.add(record, offset)
+                if record['is_Complete']:
+                    manifest.put(record['fname'], record['fingerprint'])
+    for fname, html in renderer.tool_pages(tool_records()):
+        output.page(fname, html)
+
+    manifest.save(None, output.writer.staging)
+    write_index_pages(output, renderer, page_index, store)
+    output.close()
+
+    if args.since:
+        write_changes(store, version, args.since)
+
+class QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """ serve files without logging every request, build messages stay readable """
+    def log_message(self, format=None, *args):
+        """ drop request log lines """
+        pass
+
+def get_watched_files(args=None):
+    """ return (kind, modification time, size) of the files serve watches by path
+        kind is 'library' for tool libraries and WIKI links, which need parsing, and 'page' for templates and static files
+    """
+    files = {}
+    for fname in os.listdir(args.libpath):
+        if fname[-4:] == '.dll' or fname[-3:] == '.so':
+            files['%s/%s' % (args.libpath, fname)] = 'library'
+    files['wikilinks.txt'] = 'library'
+    for path in (TEMPLATE_PATH, "%s/lib" % HTML_PATH, "%s/icons" % HTML_PATH):
+        for root, dirs, fnames in os.walk(path):
+            dirs[:] = [dname for dname in dirs if dname != '.svn']
+            for fname in fnames:
+                files[os.path.join(root, fname)] = 'page'
+
+    watched = {}
+    for fpath in files:
+        try:
+            stat = os.stat(fpath)
+        except OSError:
+            continue
+        watched[fpath] = (files[fpath], stat.st_mtime_ns, stat.st_size)
+    return watched
+
+def serve(args=None):
+    """ build once, serve html/<version> over HTTP and keep it up to date while saga_api stays loaded
+        changed libraries are parsed again incrementally, template and static file changes are rendered from the metadata store
+    """
+    import_saga_api()
+    version = util.get_saga_version()
+    args.command = 'build'
+    args.incremental = True
+    extract(args)
+
+    # later builds parse the few changed libraries in this process, so saga_api is not imported again
+    args.processes = 1
+    args.resume = False
+
+    # the handler resolves paths per request, so it serves the new tree once a build has swapped it in
+    server = http.server.ThreadingHTTPServer((args.host, args.port), functools.partial(QuietRequestHandler, directory="%s/%s" % (HTML_PATH, version)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print('\nserving {}/{} at http://{}:{}/, watching {} and {} ...'.format(HTML_PATH, version, args.host, args.port, args.libpath, TEMPLATE_PATH))
+
+    watched = get_watched_files(args)
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = get_watched_files(args)
+            changed = [fpath for fpath in set(watched) | set(current) if watched.get(fpath) != current.get(fpath)]
+            if not changed:
+                continue
+            kinds = set([(current.get(fpath) or watched.get(fpath))[0] for fpath in changed])
+            watched = current
+            for fpath in sorted(changed):
+                print('\nchanged {}'.format(fpath))
+            start = time.perf_counter()
+            try:
+                if 'library' in kinds:
+                    extract(args)
+                else:
+                    render(args)
+            except Exception:
+                traceback.print_exc()
+            print('\nupdated {}/{} in {:.2f} s, watching ...'.format(HTML_PATH, version, time.perf_counter() - start))
+    except KeyboardInterrupt:
+        server.shutdown()
+
+def main():
+    """ parse commandline and run the requested command """
+    # parse commandline
+    parser = argparse.ArgumentParser(description='import opendata for ooe application.')
+    default_libpath = '/usr/local/lib/saga'
+    if os.name == 'nt':
+        default_libpath = os.environ['SAGA_TLB']
+    parser.add_argument('command', nargs='?', default='build', choices=['build','extract','render','serve'], help='build: parse libraries and create pages (default), extract: parse libraries into the metadata store only, render: create pages from the metadata store without SAGA, serve: build, serve the pages over HTTP and update them when libraries or templates change')
+    parser.add_argument('--libpath', dest='libpath', default=default_libpath, help='path to shared object library files')
+    parser.add_argument('--lib', dest='lib', help='parse given library only')
+    parser.add_argument('--tool', dest='tool', help='parse given tool only')
+    parser.add_argument('--skip', dest='skip', help='skip libraries from beeing processed (e.g --skip imagery_classification,imagery_svm,geostatistics_kriging,ihacres)')
+    parser.add_argument('--debugjson', dest='debugjson', action='store_true', help='write JSON dictionaries for debugging to debug/ next to the pages and link them from the pages')
+    parser.add_argument('--store', dest='store', default=STORE_PATH, help='metadata store written by build and extract, read by render (default: %s)' % STORE_PATH)
+    parser.add_argument('--cache', dest='cache', default=CACHE_PATH, help='directory for the persistent saga_cmd usage cache (default: %s)' % CACHE_PATH)
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true', help='neither read nor write the saga_cmd usage cache')
+    parser.add_argument('--refresh-cache', dest='refresh_cache', action='store_true', help='ignore cached saga_cmd usage and store fresh results')
+    parser.add_argument('--resume', dest='resume', action='store_true', help='take libraries finished by an interrupted build or extract from its journal and continue with the remaining ones')
+    parser.add_argument('--incremental', dest='incremental', action='store_true', help='re-parse changed libraries only and take unchanged ones from the metadata store')
+    parser.add_argument('--usage', dest='usage', default='subprocess', choices=['native','subprocess','verify'], help='create saga_cmd usage from parsed parameters (native), by calling saga_cmd (subprocess, default) or natively with saga_cmd calls for a sample of tools whose differences are logged (verify)')
+    parser.add_argument('--usage-sample', dest='usage_sample', type=int, default=10, help='percentage of tools checked against saga_cmd in verify mode (default: 10)')
+    parser.add_argument('--jobs', dest='jobs', type=int, default=os.cpu_count() or 1, help='number of saga_cmd calls to run in parallel (default: number of CPUs)')
+    parser.add_argument('--cmd-timeout', dest='cmd_timeout', type=float, default=60, help='seconds after which a saga_cmd call is killed (default: 60)')
+    parser.add_argument('--cmd-retries', dest='cmd_retries', type=int, default=1, help='number of times a timed out saga_cmd call is repeated (default: 1)')
+    parser.add_argument('--processes', dest='processes', type=int, default=1, help='number of worker processes parsing libraries (default: 1, parse in this process)')
+    parser.add_argument('--compress', dest='compress', action='store_true', help='write precompressed .gz siblings of HTML, CSS, JS and JSON files, .br and .zst too if brotli or compression.zstd are available')
+    parser.add_argument('--dedup', dest='dedup', action='store_true', help='hard link identical files of all html/<version> trees to one copy in the object store %s' % OBJECTS_PATH)
+    parser.add_argument('--since', dest='since', help='report tools added, removed or changed since the stored build of the given SAGA version')
+    parser.add_argument('--host', dest='host', default='localhost', help='address the serve command listens on (default: localhost)')
+    parser.add_argument('--port', dest='port', type=int, default=8000, help='port the serve command listens on (default: 8000)')
+    parser.add_argument('--interval', dest='interval', type=float, default=0.5, help='seconds between checks for changed files in serve mode (default: 0.5)')
+    parser.add_argument('--profile', dest='profile', nargs='?', const='profile.json', help='time build phases per library and tool and write a JSON report (default: profile.json)')
+    parser.add_argument('--profile-top', dest='profile_top', type=int, default=10, help='number of slowest libraries and tools in the profile report (default: 10)')
+    args = parser.parse_args()
+
+    profiler.enabled = args.profile is not None
+    start = time.perf_counter()
+    if args.command == 'render':
+        render(args)
+    elif args.command == 'serve':
+        serve(args)
+    else:
+        extract(args)
+    profiler.stop(args.command, start)
+    if args.profile:
+        profiler.report(args.profile, args.profile_top)
+
+# initialize utility class
+util = Util()
+
+# initialize build phase profiler, enabled by --profile
+profiler = Profiler()
 
-# resolve startpage template
-s = Template(util.read_template('./templates/index.tpl'))
-o = open("%s/index.html" % (HTML_PATH), "wb")
-o.write(s.safe_substitute(TPL_TERMS).encode('utf8'))
-o.close()
-print('created {}/index.html'.format(HTML_PATH))
-
-# create a2z index page
-TPL_TERMS['A2Z_Links'] = ''
-
-order = list(a2z.keys())
-order.sort()
-for name in order:
-    TPL_TERMS['A2Z_Links'] += "%s\n" % ('\n'.join(a2z[name]))
-
-# resolve a2z template
-s = Template(util.read_template('./templates/a2z.tpl'))
-o = open("%s/a2z.html" % (HTML_PATH), "wb")
-o.write(s.safe_substitute(TPL_TERMS).encode('utf8'))
-o.close()
-print('created {}/a2z.html'.format(HTML_PATH))
-
-# copy lib/ and icons/ directories to html-path
-print('\ncopying ./html/lib/ and ./html/icons/ directory to {} ...'.format(HTML_PATH))
-for subdir in ('lib','icons'):
-    shutil.rmtree("%s/%s" % (HTML_PATH,subdir), True)
-    shutil.copytree("./html/%s" % subdir, "%s/%s" % (HTML_PATH,subdir))
-    shutil.rmtree("%s/%s/.svn" % (HTML_PATH,subdir), True)
-
-# finish error and debug messages
-error_log.close()
-debug_log.close()
-
-if has_errors:
-    print('\nlogged ERRORS to error_log.txt')
-if has_debug:
-    print('\nlogged DEBUG messages to debug_log.txt')
+if __name__ == '__main__':
+    main()
 
 """
 
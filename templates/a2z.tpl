@@ -3,17 +3,24 @@
 <meta name="viewport" content="width=device-width">
 <title>Full Tool Index / SAGA-GIS Tool Library Documentation (v$VERSION)</title>
 <script src="./lib/tablesort.js"></script>
+<script src="./lib/search.js"></script>
 <link rel="stylesheet" href="./lib/styles.css">
 <header>
   <a href="http://saga-gis.org/"><img class="logo" src="./icons/logo.png" alt="Logo" /></a>
   <h1>SAGA-GIS Tool Library Documentation (v$VERSION)</h1>
   <nav>
     <span><a href="index.html">Contents</a></span>
+    <span><a href="types.html">Data Types</a></span>
+    <span><a href="menus.html">Menus</a></span>
   </nav>
 </header>
 
 <main>
 <h1>Full Tool Index</h1>
+<div class="search">
+  <input type="search" id="search" placeholder="Search tools and parameters" autocomplete="off">
+  <ul id="search-results"></ul>
+</div>
 <table class="sortable">
 <tr><th class="sorted-asc">Tool</th><th>Menu</th></tr>
 $A2Z_Links
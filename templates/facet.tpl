@@ -0,0 +1,21 @@
+<!DOCTYPE html>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width">
+<title>$TITLE / SAGA-GIS Tool Library Documentation (v$VERSION)</title>
+<link rel="stylesheet" href="./lib/styles.css">
+<header>
+  <a href="http://saga-gis.org/"><img class="logo" src="./icons/logo.png" alt="Logo" /></a>
+  <h1>SAGA-GIS Tool Library Documentation (v$VERSION)</h1>
+  <nav>
+    <span><a href="index.html">Contents</a></span>
+    <span><a href="a2z.html">Tools A-Z</a></span>
+    <span><a href="types.html">Data Types</a></span>
+    <span><a href="menus.html">Menus</a></span>
+  </nav>
+</header>
+
+<main>
+<h1>$TITLE</h1>
+<p>$Facet_Links</p>
+$Facet_Content
+</main>
@@ -2,18 +2,25 @@
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width">
 <title>SAGA-GIS Tool Library Documentation (v$VERSION)</title>
+<script src="./lib/search.js"></script>
 <link rel="stylesheet" href="./lib/styles.css">
 <header>
   <a href="http://saga-gis.org/"><img class="logo" src="./icons/logo.png" alt="Logo" /></a>
   <h1>SAGA-GIS Tool Library Documentation (v$VERSION)</h1>
   <nav>
     <span class=" a2z"><a href="a2z.html">Tools A-Z</a></span>
+    <span class=" a2z"><a href="types.html">Data Types</a></span>
+    <span class=" a2z"><a href="menus.html">Menus</a></span>
     <span><a href="http://saga-gis.org/">Home</a></span>
   </nav>
 </header>
 
 <main>
 <h1>Contents</h1>
+<div class="search">
+  <input type="search" id="search" placeholder="Search tools and parameters" autocomplete="off">
+  <ul id="search-results"></ul>
+</div>
 <table>
 <tr><th>Library</th><th>Description</th><th>Tools</th></tr>
 $Library_Links
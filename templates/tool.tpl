@@ -1,11 +1,11 @@
 <!DOCTYPE html>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width">
-<title>Tool $Get_Name / SAGA-GIS Tool Library Documentation (v$VERSION)</title>
-<link rel="stylesheet" href="./lib/styles.css">
+<title>Tool $Get_Name / SAGA-GIS Tool Library Documentation$Page_Version</title>
+<link rel="stylesheet" href="./lib/styles.css">$Version_Script
 <header>
   <a href="http://saga-gis.org/"><img class="logo" src="./icons/logo.png" alt="Logo" /></a>
-  <h1>SAGA-GIS Tool Library Documentation (v$VERSION)</h1>
+  <h1>SAGA-GIS Tool Library Documentation$Page_Version</h1>
   <nav>
     <span class=" a2z"><a href="a2z.html">Tools A-Z</a></span>
     <span><a href="index.html">Contents</a></span>